@@ -1,11 +1,33 @@
+import numpy as np
+import pandas as pd
+from itertools import product
 from backtesting import Backtest, Strategy
+from streaming import stream_backtest, DEFAULT_CHUNK_SIZE
+from simulator import simulate, simulate_batch, signal_arrays
 
 class BacktestingWrapper:
-    def __init__(self, strategy, initial_cash=10000):
+    def __init__(self, strategy, initial_cash=10000, commission=0.002):
         self.strategy = strategy
         self.initial_cash = initial_cash
+        self.commission = commission
+
+    def backtest(self, data, mode="bar"):
+        """
+        Backtest a signal frame.
+
+        mode="bar" runs backtesting.py, which calls next() on every bar.
+        mode="event" jumps between signal bars with simulator.simulate_events,
+        so its cost scales with the number of signals; it gives the same
+        trades and core statistics, with the trade list under '_trades'.
+        """
+        if mode == "event":
+            stats, trades = simulate(data, self.initial_cash, self.commission, mode="event", trades=True)
+            stats["_trades"] = pd.DataFrame(trades, columns=["Size", "EntryBar", "ExitBar", "EntryPrice",
+                                                             "ExitPrice", "PnL", "ReturnPct"])
+            return stats
+        if mode != "bar":
+            raise ValueError(f"Unknown mode '{mode}'. Expected 'bar' or 'event'")
 
-    def backtest(self, data):
         class CustomStrategy(Strategy):
             def init(inner_self):
                 if 'CommonBuySignal' in data.columns:
@@ -34,7 +56,7 @@ class BacktestingWrapper:
             if "Datetime" in data.columns:
                 data = data.set_index("Datetime")
     
-            bt = Backtest(data, CustomStrategy, cash=self.initial_cash, commission=0.002)
+            bt = Backtest(data, CustomStrategy, cash=self.initial_cash, commission=self.commission)
             stats = bt.run()
     
         except ZeroDivisionError:
@@ -48,6 +70,58 @@ class BacktestingWrapper:
         return stats
 
 
+    def backtest_stream(self, path, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Out-of-core backtest of self.strategy over an OHLCV Parquet/CSV file.
+        Gives the same trades and stats as backtest() while holding only one
+        chunk of bars in memory.
+        """
+        stats, _ = stream_backtest(path, self.strategy, chunk_size=chunk_size,
+                                   initial_cash=self.initial_cash, commission=self.commission)
+        return stats
+
+    def backtest_scenarios(self, data, commission=None, slippage=(0.0,), initial_cash=None):
+        """
+        Backtest one signal frame under every combination of commission,
+        slippage and starting cash in a single batched pass: the signal
+        arrays are shared (broadcast, not copied) and each scenario is one
+        row of simulator.simulate_batch.
+
+        Slippage is charged on the entry fill like backtesting.py's
+        `spread`, so each scenario matches Backtest(cash=..., commission=...,
+        spread=slippage).
+
+        Parameters:
+        data (pandas.DataFrame): Frame with Open/Close and Buy/Sell signal columns
+        commission, slippage, initial_cash (float or list): Values to combine
+            (defaults: the wrapper's commission and cash, no slippage)
+
+        Returns:
+        pandas.DataFrame: One row of statistics per scenario
+        """
+        values = [np.atleast_1d(self.commission if commission is None else commission),
+                  np.atleast_1d(slippage),
+                  np.atleast_1d(self.initial_cash if initial_cash is None else initial_cash)]
+        scenarios = pd.DataFrame(list(product(*values)), columns=["Commission", "Slippage", "Initial Cash"])
+
+        n = len(scenarios)
+        open_, close, buy, sell = signal_arrays(data)
+        stats = simulate_batch(*(np.broadcast_to(a, (n, len(a))) for a in (open_, close, buy, sell)),
+                               initial_cash=scenarios["Initial Cash"].to_numpy(dtype=float),
+                               commission=scenarios["Commission"].to_numpy(dtype=float),
+                               slippage=scenarios["Slippage"].to_numpy(dtype=float))
+        results = pd.concat([scenarios, pd.DataFrame(stats)], axis=1)
+
+        print(f"\n[{type(self.strategy).__name__}] Cost and capital scenarios:")
+        print("{:<12} {:<10} {:<14} {:<12} {:<20} {:<10}".format(
+            "Commission", "Slippage", "Initial Cash", "Return [%]", "Max. Drawdown [%]", "# Trades"))
+        for _, row in results.iterrows():
+            print("{:<12.4f} {:<10.4f} {:<14.2f} {:<12.2f} {:<20.2f} {:<10}".format(
+                row["Commission"], row["Slippage"], row["Initial Cash"], row["Return [%]"],
+                row["Max. Drawdown [%]"], int(row["# Trades"])))
+
+        return results
+
     def extract_statistics(self, stats):
         return {
             "Number of Trades": stats.get('# Trades', 0),
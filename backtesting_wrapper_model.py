@@ -1,21 +1,37 @@
 from backtesting import Backtest, Strategy
-import pandas as pd
 from datetime import timedelta
-import os
-from lstm_close import predict_stock  # ✅ Import your LSTM function
+from forecast_service import ForecastClient
 
 class BacktestingWrapper:
-    def __init__(self, strategy=None, initial_cash=10000):
+    def __init__(self, strategy=None, initial_cash=10000, forecast_address=None, global_model=None, forecaster=None):
         self.strategy = strategy
         self.initial_cash = initial_cash
+        # Client mode: ask a shared forecast_service.ForecastServer instead of training in-process
+        # (matches in-process results with the server's default refit_after=timedelta(0))
+        self.forecast_client = ForecastClient(forecast_address) if forecast_address else None
+        # A fitted lstm_close.fit_global_model bundle: score windows with it instead of training per call.
+        # Fit it on data before the backtest span; signals inside its training data are refused (look-ahead)
+        self.global_model = global_model
+        # "ridge", "ets" or a forecasters.Forecaster: a cheap in-process model instead of the LSTM
+        self.forecaster = forecaster
 
     def run_forecast_and_read(self, ticker, signal_time, interval):
         start_date = (signal_time - timedelta(days=332)).strftime("%Y-%m-%d")
         end_date = signal_time.strftime("%Y-%m-%d")
 
-        print(f"🔮 Running LSTM forecast for {ticker}: {start_date} → {end_date}")
+        cheap = self.forecaster not in (None, "lstm")
+        label = getattr(self.forecaster, "name", self.forecaster) if cheap else "LSTM"
+        print(f"🔮 Running {label} forecast for {ticker}: {start_date} → {end_date}")
         try:
-            predicted_price = predict_stock(ticker=ticker, start_date=start_date, end_date=end_date, interval=interval)
+            if cheap:
+                from forecasters import forecast_close
+                return forecast_close(self.forecaster, ticker, start_date, end_date, interval)
+
+            if self.forecast_client is not None:
+                return self.forecast_client.predict(ticker, start_date, end_date, interval)
+
+            from lstm_close import predict_stock  # ✅ Only load torch/darts when forecasting in-process
+            predicted_price = predict_stock(ticker=ticker, start_date=start_date, end_date=end_date, interval=interval, global_model=self.global_model)
             return predicted_price
         except Exception as e:
             print(f"⚠️ Forecast error: {e}")
@@ -1,29 +1,82 @@
 from backtesting import Backtest, Strategy
-import pandas as pd
+import numpy as np
 from datetime import timedelta
-import os
-from lstm_close import predict_stock  # ✅ Import your LSTM function
+from forecast_service import ForecastClient
+from features import FeatureGraph
 
 class BacktestingWrapper:
-    def __init__(self, strategy=None, initial_cash=10000):
+    def __init__(self, strategy=None, initial_cash=10000, forecast_address=None, horizon=1, global_model=None,
+                 forecaster=None, quantile=None, num_samples=None):
         self.strategy = strategy
         self.initial_cash = initial_cash
+        # Bars ahead to forecast; the decision uses the expected move to the last one
+        self.horizon = horizon
+        # Client mode: ask a shared forecast_service.ForecastServer instead of training in-process
+        # (matches in-process results with the server's default refit_after=timedelta(0))
+        self.forecast_client = ForecastClient(forecast_address) if forecast_address else None
+        # A fitted lstm_close.fit_global_model bundle: score windows with it instead of training per call.
+        # Fit it on data before the backtest span; signals inside its training data are refused (look-ahead)
+        self.global_model = global_model
+        # "ridge", "ets" or a forecasters.Forecaster: a cheap in-process model instead of the LSTM
+        self.forecaster = forecaster
+        # Quantile gating: buy only if the `quantile` quantile of the forecast clears the threshold,
+        # sell only if the 1 - quantile quantile falls below it (None: gate on the point forecast)
+        if quantile is not None and forecaster not in (None, "lstm"):
+            raise ValueError(f"Quantile gating needs sampled LSTM forecasts; forecaster "
+                             f"{getattr(forecaster, 'name', forecaster)!r} only gives point forecasts")
+        if quantile is not None and num_samples == 1:
+            raise ValueError("Quantile gating needs num_samples > 1")
+        self.quantiles = None if quantile is None else tuple(sorted((quantile, 1 - quantile)))
+        # Sample paths per LSTM forecast (in-process or on the server), drawn in one batched predict() call
+        self.num_samples = num_samples or (100 if quantile is not None else 1)
 
     def run_forecast_and_read(self, ticker, signal_time, interval):
         start_date = (signal_time - timedelta(days=325)).strftime("%Y-%m-%d")
         end_date = signal_time.strftime("%Y-%m-%d")
 
-        print(f"🔮 Running LSTM forecast for {ticker}: {start_date} → {end_date}")
+        cheap = self.forecaster not in (None, "lstm")
+        label = getattr(self.forecaster, "name", self.forecaster) if cheap else "LSTM"
+        print(f"🔮 Running {label} forecast for {ticker}: {start_date} → {end_date}")
         try:
-            predicted_price = predict_stock(ticker=ticker, start_date=start_date, end_date=end_date, interval=interval)
+            if cheap:
+                from forecasters import forecast_close
+                return forecast_close(self.forecaster, ticker, start_date, end_date, interval, horizon=self.horizon)
+
+            if self.forecast_client is not None:
+                return self.forecast_client.predict(ticker, start_date, end_date, interval, horizon=self.horizon,
+                                                    num_samples=self.num_samples, quantiles=self.quantiles or (0.5,))
+
+            from lstm_close import predict_stock  # ✅ Only load torch/darts when forecasting in-process
+            predicted_price = predict_stock(ticker=ticker, start_date=start_date, end_date=end_date, interval=interval,
+                                            horizon=self.horizon, global_model=self.global_model,
+                                            num_samples=self.num_samples, quantiles=self.quantiles or (0.5,))
             return predicted_price
         except Exception as e:
             print(f"⚠️ Forecast error: {e}")
             return None
 
+    def forecast_bounds(self, forecast):
+        """
+        Point forecast and lower/upper gating bounds of the close `horizon`
+        bars ahead. Without quantile gating (or with num_samples=1) the
+        point forecast is its own bound.
+        """
+        if not isinstance(forecast, dict):
+            price = float(np.atleast_1d(forecast)[-1])
+            return price, price, price
+        price = float(np.atleast_1d(forecast["mean"])[-1])
+        if self.quantiles is None:
+            return price, price, price
+        lower, upper = (float(np.atleast_1d(forecast["quantiles"][q])[-1]) for q in self.quantiles)
+        return price, lower, upper
+
     def backtest(self, data, ticker="TSLA", interval="1h"):
         wrapper = self
 
+        # ATR of every bar in one pass, shared through the feature cache instead of rebuilt in next()
+        atr_window = 14
+        atr = FeatureGraph(data).get("atr", window=atr_window)
+
         class CustomStrategy(Strategy):
             def init(inner_self):
                 if 'CommonBuySignal' in data.columns:
@@ -40,30 +93,12 @@ class BacktestingWrapper:
                 current_time = inner_self.data.index[-1]
                 current_price = inner_self.data.Close[-1]
             
-                # ATR parameters
-                window = 14
-                
                 # Only proceed if there's enough data
-                if len(inner_self.data) >= window + 1:
-                    # Convert _Array to proper pandas Series via list
-                    ohlc = pd.DataFrame({
-                        'High': list(inner_self.data.High[-(window + 1):]),
-                        'Low': list(inner_self.data.Low[-(window + 1):]),
-                        'Close': list(inner_self.data.Close[-(window + 1):])
-                    })
-                
-                    # Compute True Range components
-                    tr1 = ohlc['High'] - ohlc['Low']
-                    tr2 = (ohlc['High'] - ohlc['Close'].shift(1)).abs()
-                    tr3 = (ohlc['Low'] - ohlc['Close'].shift(1)).abs()
-                    true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-                
-                    # Compute ATR as rolling mean of TR
-                    atr = true_range.rolling(window=window).mean().iloc[-1]
-                
-                    # Volatility-adjusted threshold
-                    current_price = inner_self.data.Close[-1]
-                    adaptive_thresh = max(0.005, (atr / current_price) * 1.5)
+                i = len(inner_self.data) - 1
+                if i >= atr_window:
+                    # Volatility-adjusted threshold from the precomputed ATR
+                    # Volatility grows with the square root of the bars forecast ahead
+                    adaptive_thresh = max(0.005, (atr[i] / current_price) * 1.5 * np.sqrt(wrapper.horizon))
                 else:
                     adaptive_thresh = 0.005  # fallback if not enough data
 
@@ -75,9 +110,12 @@ class BacktestingWrapper:
                     predicted_price = wrapper.run_forecast_and_read(ticker, current_time, interval)
                     if predicted_price is None:
                         return
+                    # Close `horizon` bars ahead; the upper bound must clear the threshold too
+                    predicted_price, _, upper = wrapper.forecast_bounds(predicted_price)
                     delta = (predicted_price - current_price) / current_price
-                    print(f"📉 Current Price: {current_price:.2f}, Forecasted Price: {predicted_price:.2f}, Delta: {delta:.4f}, Threshold: {adaptive_thresh:.4f}")
-                    if predicted_price < current_price and delta < -adaptive_thresh:
+                    upper_delta = (upper - current_price) / current_price
+                    print(f"📉 Current Price: {current_price:.2f}, Forecasted Price: {predicted_price:.2f}, Delta: {delta:.4f}, Upper Delta: {upper_delta:.4f}, Threshold: {adaptive_thresh:.4f}")
+                    if predicted_price < current_price and delta < -adaptive_thresh and upper_delta < -adaptive_thresh:
                         print(f"🔻 SELL Decision: Δ={delta:.4f}")
                         inner_self.position.close()
                         print(f"✅ Trade Executed: SOLD at {current_time} | Price: {current_price:.2f}")
@@ -90,9 +128,12 @@ class BacktestingWrapper:
                     predicted_price = wrapper.run_forecast_and_read(ticker, current_time, interval)
                     if predicted_price is None:
                         return
+                    # Close `horizon` bars ahead; the lower bound must clear the threshold too
+                    predicted_price, lower, _ = wrapper.forecast_bounds(predicted_price)
                     delta = (predicted_price - current_price) / current_price
-                    print(f"📈 Current Price: {current_price:.2f}, Forecasted Price: {predicted_price:.2f}, Delta: {delta:.4f}, Threshold: {adaptive_thresh:.4f}")
-                    if predicted_price > current_price and delta > adaptive_thresh:
+                    lower_delta = (lower - current_price) / current_price
+                    print(f"📈 Current Price: {current_price:.2f}, Forecasted Price: {predicted_price:.2f}, Delta: {delta:.4f}, Lower Delta: {lower_delta:.4f}, Threshold: {adaptive_thresh:.4f}")
+                    if predicted_price > current_price and delta > adaptive_thresh and lower_delta > adaptive_thresh:
                         size = inner_self.equity // current_price
                         if size > 0:
                             print(f"🔺 BUY Decision: Δ={delta:.4f}")
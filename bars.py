@@ -0,0 +1,143 @@
+import yfinance as yf
+import numpy as np
+import pandas as pd
+
+from data_loader import fetch_data
+from market_calendar import SESSION_OPEN, session_mask, regularize_sessions
+
+# yfinance interval names → bar length
+INTERVALS = {
+    "1m": pd.Timedelta(minutes=1),
+    "2m": pd.Timedelta(minutes=2),
+    "5m": pd.Timedelta(minutes=5),
+    "15m": pd.Timedelta(minutes=15),
+    "30m": pd.Timedelta(minutes=30),
+    "60m": pd.Timedelta(hours=1),
+    "1h": pd.Timedelta(hours=1),
+    "1d": pd.Timedelta(days=1),
+}
+
+# Cache of BarSet objects keyed by (ticker, start_date, end_date, base_interval)
+bar_cache = {}
+
+
+def aggregate_bars(df, interval, session_open=SESSION_OPEN):
+    """
+    Aggregate sorted OHLCV bars to a coarser interval.
+
+    Intraday bins are anchored at the session open (09:30, 10:30, ... for 1h,
+    like Yahoo's own hourly bars) and never span two sessions. Daily bars
+    group by calendar date.
+
+    Parameters:
+    df (pandas.DataFrame): Bars with 'Datetime' and OHLCV columns, sorted by Datetime
+    interval (str): Target interval, e.g. "30m", "1h" or "1d"
+
+    Returns:
+    pandas.DataFrame: Aggregated bars labelled by bin start
+    """
+    if interval not in INTERVALS:
+        raise ValueError(f"Unsupported interval '{interval}'. Expected one of {list(INTERVALS)}")
+    if df.empty:
+        return df.copy()
+
+    times = df["Datetime"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    day_ns = pd.Timedelta(days=1).value
+    day = times - times % day_ns
+
+    if interval == "1d":
+        keys = day
+    else:
+        bin_ns = INTERVALS[interval].value
+        anchor = day + session_open.value
+        keys = anchor + ((times - anchor) // bin_ns) * bin_ns
+
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)] - 1
+
+    bars = pd.DataFrame({
+        "Datetime": keys[starts].view("datetime64[ns]"),
+        "Open": df["Open"].to_numpy()[starts],
+        "High": np.maximum.reduceat(df["High"].to_numpy(), starts),
+        "Low": np.minimum.reduceat(df["Low"].to_numpy(), starts),
+        "Close": df["Close"].to_numpy()[ends],
+        "Volume": np.add.reduceat(df["Volume"].to_numpy(), starts),
+    })
+    if "Source" in df.columns:
+        bars["Source"] = df["Source"].to_numpy()[ends]
+    return bars
+
+
+class BarSet:
+    """
+    One fetched base-resolution frame plus the coarser resolutions derived
+    from it, each aggregated at most once.
+    """
+
+    def __init__(self, base, base_interval, regular_session=True):
+        if regular_session and INTERVALS[base_interval] < INTERVALS["1d"]:
+            base = base[session_mask(base["Datetime"])].reset_index(drop=True)
+        self.base_interval = base_interval
+        self.frames = {base_interval: base}
+
+    def get(self, interval):
+        if interval not in self.frames:
+            if INTERVALS[interval] < INTERVALS[self.base_interval]:
+                raise ValueError(f"Cannot derive {interval} bars from {self.base_interval} bars")
+            if INTERVALS[interval] % INTERVALS[self.base_interval] != pd.Timedelta(0):
+                raise ValueError(f"{interval} is not a multiple of {self.base_interval}")
+            self.frames[interval] = aggregate_bars(self.frames[self.base_interval], interval)
+        return self.frames[interval]
+
+
+def fetch_multi_resolution(ticker, start_date, end_date, intervals, base_interval="15m",
+                           include_forecast=False, regular_session=True):
+    """
+    Fetch the base interval once and derive every requested interval from it.
+
+    Returns:
+    dict: interval → DataFrame of bars
+    """
+    key = (ticker.upper(), start_date, end_date, base_interval, include_forecast, regular_session)
+    if key not in bar_cache:
+        base = fetch_data(ticker, start_date, end_date, base_interval, include_forecast=include_forecast)
+        bar_cache[key] = BarSet(base, base_interval, regular_session=regular_session)
+
+    bar_set = bar_cache[key]
+    return {interval: bar_set.get(interval) for interval in intervals}
+
+
+def load_history(ticker, start_date, end_date, interval="1h", data=None):
+    # Reuse bars that were already fetched/aggregated (e.g. fetch_multi_resolution)
+    if data is not None:
+        df = data.set_index("Datetime")[['Open', 'High', 'Low', 'Close', 'Volume']]
+        df = df[(df.index >= pd.Timestamp(start_date)) & (df.index < pd.Timestamp(end_date))]
+    else:
+        df = yf.download(ticker, start=start_date, end=end_date, interval=interval)
+
+    # ✅ Adjust OHLC based on Adj Close to correct for stock splits
+    if 'Adj Close' in df.columns and 'Close' in df.columns:
+        adjustment_factor = df["Adj Close"] / df["Close"]
+        df["Close"] = df["Adj Close"]
+        df["Open"] *= adjustment_factor
+        df["High"] *= adjustment_factor
+        df["Low"] *= adjustment_factor
+
+    df.index = pd.DatetimeIndex(df.index)
+
+    # Exchange-local wall time, the time the session calendar is defined in
+    if df.index.tz is not None:
+        df.index = df.index.tz_convert("US/Eastern").tz_localize(None)
+
+    # Only trading-session bars: gaps inside a session are filled, nights/weekends/holidays are not created
+    df = regularize_sessions(df, INTERVALS.get(interval, INTERVALS["1h"]))
+
+    if len(df) < 10:
+        print(f"⚠️ Not enough data ({len(df)} rows) for model training. Skipping...")
+        return None
+
+    if df.empty:
+        print("⚠️ No data returned. Try adjusting date range or checking ticker.")
+        return None
+
+    return df
@@ -1,10 +1,58 @@
 import yfinance as yf
 import pandas as pd
+import numpy as np
 import os
+import hashlib
+from forecast_store import ForecastStore, merge_forecast
 
-FORECAST_DIR = "forecasts"  # Where forecast CSVs are saved
+FORECAST_DIR = "forecasts"  # Where legacy forecast CSVs are saved
 
-def fetch_data(ticker, start_date, end_date, interval, include_forecast=True):
+SIGNAL_PREFIXES = ("BuySignal", "SellSignal", "CommonBuySignal", "CommonSellSignal")
+
+
+def compact_frame(df):
+    """
+    Shrink an OHLCV/signal frame for holding many tickers in memory.
+
+    - float64 columns (prices and indicator intermediates) become float32
+    - Volume becomes the smallest signed integer type that holds it
+    - Source becomes categorical
+    - Buy/Sell signal columns become uint8
+
+    Use check_compact_rankings in utils.py to confirm optimizer rankings
+    are unchanged for a given dataset.
+    """
+    df = df.copy()
+
+    for col in df.columns:
+        if col.startswith(SIGNAL_PREFIXES):
+            df[col] = df[col].fillna(False).astype(np.uint8)
+        elif col == "Volume":
+            volume = df[col].fillna(0)
+            if np.all(np.mod(volume, 1) == 0):
+                # Signed so that OBV-style differences cannot wrap around
+                df[col] = pd.to_numeric(volume.astype(np.int64), downcast="integer")
+            else:
+                df[col] = volume.astype(np.float32)
+        elif col == "Source":
+            df[col] = df[col].astype("category")
+        elif df[col].dtype == np.float64:
+            df[col] = df[col].astype(np.float32)
+
+    return df
+
+
+def dataset_fingerprint(df):
+    """
+    Content hash of a price frame's Datetime/OHLCV columns, used to key
+    caches so results for one dataset are never reused for another.
+    """
+    columns = [c for c in ("Datetime", "Open", "High", "Low", "Close", "Volume") if c in df.columns]
+    hashes = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+    return hashlib.sha1(hashes.tobytes()).hexdigest()
+
+
+def fetch_data(ticker, start_date, end_date, interval, include_forecast=True, compact=False):
     """
     Fetch adjusted stock data from Yahoo Finance and clean it.
     Optionally append forecasted data from CSV if available.
@@ -15,6 +63,12 @@ def fetch_data(ticker, start_date, end_date, interval, include_forecast=True):
     - Forward/backward fill
     - Remove duplicate timestamps
     - Optional forecast merging with historical priority
+
+    Forecasts are read from the Parquet ForecastStore, restricted to rows from
+    start_date onwards. A legacy CSV is (re-)imported into the store whenever it
+    is newer than the stored parts.
+
+    With compact=True the result is passed through compact_frame.
     """
     print(f"📥 Fetching {interval} data for {ticker} from {start_date} to {end_date}...")
 
@@ -57,18 +111,19 @@ def fetch_data(ticker, start_date, end_date, interval, include_forecast=True):
     data["Datetime"] = pd.to_datetime(data["Datetime"]).dt.tz_localize(None)
     data["Source"] = "Historical"
 
+    data = data.sort_values("Datetime").reset_index(drop=True)
+
     # Include forecast data
     if include_forecast:
+        store = ForecastStore()
         forecast_path = os.path.join(FORECAST_DIR, f"{ticker}_forecast_combined.csv")
-        if os.path.exists(forecast_path):
-            forecast_df = pd.read_csv(forecast_path, parse_dates=["Datetime"])
-            forecast_df["Datetime"] = forecast_df["Datetime"].dt.tz_localize(None)
-            forecast_df["Source"] = "Forecast"
+        # The CSV stays the source of truth: re-import it whenever it is newer than the stored parts
+        if os.path.exists(forecast_path) and os.path.getmtime(forecast_path) > (store.last_modified(ticker) or 0):
+            store.import_csv(ticker, forecast_path, replace=True)
 
+        forecast_df = store.read(ticker, start=start_date)
+        if forecast_df is not None and not forecast_df.empty:
             # Combine with historical data, keeping historical in case of overlaps
-            merged = pd.concat([forecast_df, data], ignore_index=True)
-            merged = merged.drop_duplicates(subset="Datetime", keep="last")
-            merged = merged.sort_values("Datetime").reset_index(drop=True)
-            return merged
+            data = merge_forecast(data, forecast_df)
 
-    return data.sort_values("Datetime").reset_index(drop=True)
+    return compact_frame(data) if compact else data
@@ -0,0 +1,204 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+from darts import TimeSeries
+from darts.utils.data import ShiftedTorchTrainingDataset
+from darts.utils.data.torch_datasets.training_dataset import TorchTrainingDataset
+from darts.utils.data.torch_datasets.utils import TorchTrainingSample
+
+DATASET_STORE_DIR = os.path.join("datasets", "store")
+TARGET_COLS = ['Close']
+COVARIATE_COLS = ['High', 'Open', 'Low', 'Volume']
+STORE_VERSION = 2  # 2: unscaled arrays, scalers fitted per training window
+
+
+class DatasetStore:
+    """
+    Preprocessed LSTM inputs on disk, one directory per ticker and interval:
+    unscaled float32 target and covariate arrays (.npy, opened memory-mapped),
+    their timestamps, and the stored date range (meta.json).
+
+    Nothing is scaled at write time: every training window fits its own
+    MinMax scalers on its train split (StoredDataset.fit_scalers), so a
+    store covering a longer range than the window leaks no later min/max
+    into it.
+
+    Layout:
+        <root>/<TICKER>/<interval>/target.npy      (bars, 1)
+        <root>/<TICKER>/<interval>/covariates.npy  (bars, 4)
+        <root>/<TICKER>/<interval>/times.npy       int64 ns, exchange-local session bar starts
+        <root>/<TICKER>/<interval>/meta.json
+    """
+
+    def __init__(self, root=DATASET_STORE_DIR):
+        self.root = root
+
+    def _dir(self, ticker, interval):
+        return os.path.join(self.root, ticker.upper(), interval)
+
+    def has(self, ticker, interval):
+        return os.path.exists(os.path.join(self._dir(ticker, interval), "meta.json"))
+
+    def write(self, ticker, interval, df, start_date=None, end_date=None):
+        """
+        Persist a session-regular frame (lstm_close.load_history output) as
+        float32 arrays.
+
+        start_date and end_date record the range df was loaded for (default:
+        its first bar and just after its last), so windows outside it are
+        refused rather than silently clamped to the stored bars. Files are
+        replaced atomically, so datasets already opened keep their old maps.
+
+        Returns:
+        StoredDataset: The dataset just written, opened memory-mapped
+        """
+        path = self._dir(ticker, interval)
+        os.makedirs(path, exist_ok=True)
+
+        def save(name, array):
+            tmp_path = os.path.join(path, f".{name}.tmp.npy")
+            np.save(tmp_path, array)
+            os.replace(tmp_path, os.path.join(path, name))
+
+        save("target.npy", df[TARGET_COLS].to_numpy(dtype=np.float32))
+        save("covariates.npy", df[COVARIATE_COLS].to_numpy(dtype=np.float32))
+        save("times.npy", pd.DatetimeIndex(df.index).as_unit("ns").asi8)
+
+        meta = {
+            "ticker": ticker.upper(),
+            "interval": interval,
+            "version": STORE_VERSION,
+            "start_date": pd.Timestamp(df.index[0] if start_date is None else start_date).isoformat(),
+            "end_date": pd.Timestamp(df.index[-1] + pd.Timedelta(1) if end_date is None else end_date).isoformat()
+        }
+        with open(os.path.join(path, ".meta.json.tmp"), "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(os.path.join(path, ".meta.json.tmp"), os.path.join(path, "meta.json"))
+
+        print(f"💾 Stored {len(df)} bars for {ticker.upper()} ({interval}) in {path}")
+        return self.open(ticker, interval)
+
+    def open(self, ticker, interval):
+        path = self._dir(ticker, interval)
+        if not self.has(ticker, interval):
+            raise FileNotFoundError(f"No stored dataset for {ticker.upper()} ({interval}) under {self.root}")
+        return StoredDataset(path)
+
+
+class StoredDataset:
+    """One ticker/interval of a DatasetStore; arrays are read-only memory maps."""
+
+    def __init__(self, path):
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.target = np.load(os.path.join(path, "target.npy"), mmap_mode="r")
+        self.covariates = np.load(os.path.join(path, "covariates.npy"), mmap_mode="r")
+        self.times = np.load(os.path.join(path, "times.npy"), mmap_mode="r")
+
+    def __len__(self):
+        return len(self.target)
+
+    def fit_scalers(self, start, end):
+        """
+        MinMax scalers of the target and covariates fitted on positions
+        [start, end), like split_and_scale fits them on a frame's train part.
+
+        Returns:
+        tuple: (target_scaler, covariate_scaler)
+        """
+        return (MinMaxScaler().fit(np.asarray(self.target[start:end], dtype=float)),
+                MinMaxScaler().fit(np.asarray(self.covariates[start:end], dtype=float)))
+
+    def covers(self, start_date=None, end_date=None):
+        """Whether [start_date, end_date) lies inside the range the bars were stored for."""
+        if self.meta.get("version") != STORE_VERSION:
+            return False  # Older layouts hold pre-scaled arrays
+        return ((start_date is None or pd.Timestamp(start_date) >= pd.Timestamp(self.meta["start_date"])) and
+                (end_date is None or pd.Timestamp(end_date) <= pd.Timestamp(self.meta["end_date"])))
+
+    def positions(self, start_date=None, end_date=None):
+        """
+        Half-open [start, end) bar positions covering [start_date, end_date)
+        (exchange-local, like load_history). Raises ValueError for a window
+        outside the stored range instead of clamping it to the stored bars.
+        """
+        if not self.covers(start_date, end_date):
+            raise ValueError(f"[{start_date}, {end_date}) is outside the stored range "
+                             f"[{self.meta.get('start_date')}, {self.meta.get('end_date')}) of "
+                             f"{self.meta['ticker']} ({self.meta['interval']}); preprocess_to_store it again")
+        start = 0 if start_date is None else int(np.searchsorted(self.times, pd.Timestamp(start_date).value))
+        end = len(self) if end_date is None else int(np.searchsorted(self.times, pd.Timestamp(end_date).value))
+        return start, end
+
+    def training_dataset(self, length, scalers, start=0, end=None):
+        """
+        Windows of `length` bars from positions [start, end), scaled with
+        `scalers` (from fit_scalers), for RNNModel.fit_from_dataset.
+        """
+        return StoredShiftedDataset(self, length, start, len(self) if end is None else end, scalers)
+
+    def inference_series(self, end, length, scalers, horizon=1):
+        """
+        The `length` bars before position `end`, scaled with `scalers`, as
+        float32 TimeSeries indexed by bar position, with covariates extended
+        over `horizon` bars by repeating the last row.
+
+        Returns:
+        tuple: (target TimeSeries, future covariates TimeSeries)
+        """
+        target_scaler, covariate_scaler = scalers
+        start = max(0, end - length)
+        target = target_scaler.transform(np.asarray(self.target[start:end], dtype=float)).astype(np.float32)
+        covariates = covariate_scaler.transform(np.asarray(self.covariates[start:end], dtype=float)).astype(np.float32)
+        covariates = np.concatenate([covariates, np.repeat(covariates[-1:], horizon, axis=0)])
+        return (TimeSeries.from_times_and_values(pd.RangeIndex(start, end), target,
+                                                 columns=TARGET_COLS),
+                TimeSeries.from_times_and_values(pd.RangeIndex(start, end + horizon), covariates,
+                                                 columns=COVARIATE_COLS))
+
+
+class StoredShiftedDataset(ShiftedTorchTrainingDataset):
+    """
+    RNNModel's shifted training windows sliced straight out of the memory
+    maps: each sample is `length` input bars and the same window shifted by
+    one bar, without building TimeSeries objects. Only the sample's own
+    bars are scaled (with the window's scalers) when it is drawn.
+    """
+
+    def __init__(self, dataset, length, start, end, scalers):
+        TorchTrainingDataset.__init__(self)
+        if end - start < length + 1:
+            raise ValueError(f"Need at least {length + 1} bars to build a training window, got {end - start}")
+        self.dataset = dataset
+        self.input_chunk_length = length
+        self.output_chunk_length = length
+        self.shift = 1
+        self.start = start
+        self.n_samples = end - start - length
+        # MinMaxScaler.transform is x * scale_ + min_
+        self.target_scaling = (scalers[0].scale_, scalers[0].min_)
+        self.covariate_scaling = (scalers[1].scale_, scalers[1].min_)
+
+    @staticmethod
+    def _scale(values, scaling):
+        scale, offset = scaling
+        return (values * scale + offset).astype(np.float32)
+
+    def __len__(self):
+        return self.n_samples
+
+    def __getitem__(self, index):
+        past = slice(self.start + index, self.start + index + self.input_chunk_length)
+        future = slice(past.start + self.shift, past.stop + self.shift)
+        bars = slice(past.start, future.stop)
+        target = self._scale(self.dataset.target[bars], self.target_scaling)
+        covariates = self._scale(self.dataset.covariates[bars], self.covariate_scaling)
+        return TorchTrainingSample(
+            past_target=target[:-1],
+            historic_future_covariates=covariates[:-1],
+            future_covariates=covariates[1:],
+            future_target=target[1:]
+        )
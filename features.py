@@ -0,0 +1,187 @@
+import inspect
+from collections import OrderedDict
+
+import numpy as np
+
+import strategies.backend as indicators
+from data_loader import dataset_fingerprint
+
+FEATURE_CACHE_BYTES = 256 * 2**20  # Default memory bound of the shared feature cache
+
+# Registered feature functions: name -> function(graph, **params) -> numpy.ndarray
+_FEATURES = {}
+
+
+def feature(name):
+    """Register a feature function under `name` for FeatureGraph.get."""
+    def register(func):
+        _FEATURES[name] = func
+        return func
+    return register
+
+
+class FeatureCache:
+    """
+    Least-recently-used store of computed feature arrays, bounded by their
+    total size in bytes. Shared by every FeatureGraph unless one is given
+    its own cache.
+    """
+
+    def __init__(self, max_bytes=FEATURE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if key in self.entries:
+            self.nbytes -= self.entries.pop(key).nbytes
+        self.entries[key] = value
+        self.nbytes += value.nbytes
+        while self.nbytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+    def clear(self):
+        self.entries.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+
+feature_cache = FeatureCache()
+
+
+class FeatureGraph:
+    """
+    Memoised indicator intermediates of one price frame.
+
+    Features are looked up by name and parameters; each is computed once
+    per (dataset, backend, feature, params) and then shared through the
+    cache by every strategy, combination and sweep that builds a graph on
+    the same data. Features may depend on other features, so e.g. ATR
+    reuses the cached true range.
+
+    Returned arrays are read-only and aligned with the frame's rows.
+    """
+
+    def __init__(self, df, backend=None, cache=None, fingerprint=None):
+        self.df = df
+        self.backend = indicators.resolve_backend(backend)
+        self.cache = feature_cache if cache is None else cache
+        self.fingerprint = fingerprint or dataset_fingerprint(df)
+
+    def get(self, name, **params):
+        """
+        Value of a registered feature, or of a raw frame column when `name`
+        is not a feature (e.g. "Close").
+        """
+        if name not in _FEATURES:
+            return self.df[name].to_numpy(dtype=float)
+
+        key = (self.fingerprint, self.backend, name, tuple(sorted(params.items())))
+        value = self.cache.get(key)
+        if value is None:
+            value = np.asarray(_FEATURES[name](self, **params))
+            value.flags.writeable = False
+            self.cache.put(key, value)
+        return value
+
+
+def accepts_features(strategy):
+    """Whether a strategy (class or instance) can take a FeatureGraph in apply_strategy."""
+    return "features" in inspect.signature(strategy.apply_strategy).parameters
+
+
+# --- Features --------------------------------------------------------------
+
+@feature("typical_price")
+def _typical_price(graph):
+    return (graph.get("High") + graph.get("Low") + graph.get("Close")) / 3
+
+
+@feature("true_range")
+def _true_range(graph):
+    high, low, close = graph.get("High"), graph.get("Low"), graph.get("Close")
+    prev_close = indicators.shift(close)
+    return np.maximum(np.maximum(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+
+
+@feature("atr")
+def _atr(graph, window=14):
+    return indicators.rolling_mean(graph.get("true_range"), window, backend=graph.backend)
+
+
+@feature("rolling_mean")
+def _rolling_mean(graph, source="Close", window=20, min_periods=None):
+    return indicators.rolling_mean(graph.get(source), window, min_periods=min_periods, backend=graph.backend)
+
+
+@feature("rolling_std")
+def _rolling_std(graph, source="Close", window=20, min_periods=None):
+    return indicators.rolling_std(graph.get(source), window, min_periods=min_periods, backend=graph.backend)
+
+
+@feature("mean_deviation")
+def _mean_deviation(graph, window=20):
+    # CCI's mean absolute deviation of the typical price from its SMA
+    typical = graph.get("typical_price")
+    sma = graph.get("rolling_mean", source="typical_price", window=window, min_periods=1)
+    return indicators.rolling_mean(np.abs(typical - sma), window, min_periods=1, backend=graph.backend)
+
+
+@feature("dema")
+def _dema(graph, source="Close", span=12):
+    return indicators.dema(graph.get(source), span, backend=graph.backend)
+
+
+@feature("macd")
+def _macd(graph, fast_length=12, slow_length=26):
+    return graph.get("dema", span=fast_length) - graph.get("dema", span=slow_length)
+
+
+@feature("macd_signal")
+def _macd_signal(graph, fast_length=12, slow_length=26, signal_length=9):
+    macd = graph.get("macd", fast_length=fast_length, slow_length=slow_length)
+    return indicators.dema(macd, signal_length, backend=graph.backend)
+
+
+@feature("dm_plus")
+def _dm_plus(graph):
+    return indicators.directional_movement(graph.get("High"), graph.get("Low"))[0]
+
+
+@feature("dm_minus")
+def _dm_minus(graph):
+    return indicators.directional_movement(graph.get("High"), graph.get("Low"))[1]
+
+
+@feature("dx")
+def _dx(graph, window=14):
+    plus = graph.get("rolling_mean", source="dm_plus", window=window)
+    minus = graph.get("rolling_mean", source="dm_minus", window=window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.abs(plus - minus) / (plus + minus) * 100
+
+
+@feature("adx")
+def _adx(graph, window=14):
+    return indicators.rolling_mean(graph.get("dx", window=window), window, backend=graph.backend)
+
+
+@feature("obv")
+def _obv(graph):
+    return indicators.obv(graph.get("Close"), graph.df['Volume'].to_numpy(), backend=graph.backend)
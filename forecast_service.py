@@ -0,0 +1,207 @@
+import argparse
+import queue
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from multiprocessing.connection import Listener, Client
+
+DEFAULT_ADDRESS = ("localhost", 6001)  # A str address is used as a Unix socket path
+DEFAULT_AUTHKEY = b"fyp-forecast"
+
+
+class _Request:
+    def __init__(self, message):
+        self.message = message
+        self.price = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class ForecastServer:
+    """
+    Long-lived forecast process shared by many backtest workers.
+
+    Fitted LSTM bundles stay resident per (ticker, interval), keyed by the
+    last bar they were trained on. A window is only ever scored by a bundle
+    trained on bars up to its own last bar, so backtest requests never see
+    a model fitted on their future. Requests that arrive within batch_window
+    seconds of each other are grouped: each distinct window is loaded once
+    and all windows served by the same bundle are scored in a single
+    predict() call. Requests with num_samples > 1 get the same sampled
+    {'mean', 'quantiles'} summary predict_stock returns in-process.
+
+    With the default refit_after=timedelta(0) a window is only scored by a
+    bundle trained up to its own last bar, which is what predict_stock does
+    in-process, so client and in-process backtests agree; the server still
+    saves the repeated fits of identical windows from different workers.
+    A larger refit_after (or None: never refit) reuses older bundles for
+    speed, and results then differ from the in-process path. At most
+    max_models bundles stay resident per (ticker, interval), least recently
+    used first out.
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, authkey=DEFAULT_AUTHKEY, batch_window=0.05,
+                 use_best_config=True, refit_after=timedelta(0), torch_threads=None, max_models=4):
+        self.address = address
+        self.authkey = authkey
+        self.batch_window = batch_window
+        self.use_best_config = use_best_config
+        self.refit_after = refit_after  # timedelta, or None to reuse the newest usable model however old
+        self.max_models = max_models
+        self.torch_threads = torch_threads
+        self.models = {}  # (ticker, interval) -> OrderedDict {training last_time: bundle}, in LRU order
+        self.requests = queue.Queue()
+
+    def serve_forever(self):
+        if self.torch_threads:
+            import torch
+            torch.set_num_threads(self.torch_threads)
+
+        threading.Thread(target=self._batch_loop, daemon=True).start()
+        with Listener(self.address, authkey=self.authkey) as listener:
+            print(f"🔮 Forecast server listening on {self.address}")
+            while True:
+                conn = listener.accept()
+                threading.Thread(target=self._handle_client, args=(conn,), daemon=True).start()
+
+    def _handle_client(self, conn):
+        with conn:
+            while True:
+                try:
+                    message = conn.recv()
+                except EOFError:
+                    return
+                request = _Request(message)
+                self.requests.put(request)
+                request.done.wait()
+                conn.send({"price": request.price, "error": request.error})
+
+    def _batch_loop(self):
+        while True:
+            batch = [self.requests.get()]
+            deadline = time.monotonic() + self.batch_window
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._process(batch)
+
+    def _process(self, batch):
+        groups = {}
+        for request in batch:
+            m = request.message
+            key = (m["ticker"].upper(), m.get("interval", "1h"), m.get("horizon", 1),
+                   m.get("num_samples", 1), tuple(m.get("quantiles", ())))
+            groups.setdefault(key, []).append(request)
+
+        for (ticker, interval, horizon, num_samples, quantiles), requests in groups.items():
+            try:
+                self._process_group(ticker, interval, requests, horizon, num_samples, quantiles)
+            except Exception as e:
+                for request in requests:
+                    request.error = str(e)
+            for request in requests:
+                request.done.set()
+
+    def _process_group(self, ticker, interval, requests, horizon=1, num_samples=1, quantiles=()):
+        from lstm_close import load_history, fit_model, forecast_batch, summarize_samples, DEFAULT_QUANTILES
+
+        # Identical windows from different workers are loaded and scored once
+        windows = {}
+        for request in requests:
+            windows.setdefault((request.message["start_date"], request.message["end_date"]), []).append(request)
+
+        frames = {}
+        for (start_date, end_date) in windows:
+            df = load_history(ticker, start_date, end_date, interval=interval)
+            if df is not None:
+                frames[(start_date, end_date)] = df
+        if not frames:
+            return
+
+        # Earliest windows first, so a model fitted for one can serve the later ones
+        resident = self.models.setdefault((ticker, interval), OrderedDict())
+        served = {}
+        for window in sorted(frames, key=lambda w: frames[w].index[-1]):
+            last_time = frames[window].index[-1]
+            usable = [t for t in resident if t <= last_time]
+            trained_to = max(usable) if usable else None
+            if trained_to is None or (self.refit_after is not None and last_time - trained_to > self.refit_after):
+                print(f"🧠 Fitting resident model for {ticker} ({interval}) on {window[0]} → {window[1]}")
+                bundle = fit_model(ticker, frames[window], interval=interval, use_best_config=self.use_best_config)
+                trained_to = bundle["last_time"]
+                resident[trained_to] = bundle
+                if len(resident) > self.max_models:
+                    resident.popitem(last=False)
+            resident.move_to_end(trained_to)
+            served.setdefault(trained_to, (resident[trained_to], []))[1].append(window)
+
+        # Bundles are held here, so one evicted by a later fit of this group still scores its windows
+        for bundle, ordered in served.values():
+            prices = forecast_batch(bundle, [frames[w] for w in ordered], horizon=horizon, num_samples=num_samples)
+            for window, price in zip(ordered, prices):
+                if num_samples > 1:
+                    price = summarize_samples(price, quantiles or DEFAULT_QUANTILES)
+                    if horizon == 1:
+                        price = {"mean": float(price["mean"][0]),
+                                 "quantiles": {q: float(v[0]) for q, v in price["quantiles"].items()}}
+                elif horizon == 1:
+                    price = float(price[0])
+                for request in windows[window]:
+                    request.price = price
+
+
+class ForecastClient:
+    """Client side of ForecastServer; one connection per client object."""
+
+    def __init__(self, address=DEFAULT_ADDRESS, authkey=DEFAULT_AUTHKEY):
+        self.address = address
+        self.authkey = authkey
+        self.conn = None
+
+    def predict(self, ticker, start_date, end_date, interval="1h", horizon=1, num_samples=1, quantiles=None):
+        """
+        Forecast like lstm_close.predict_stock on the server: a close (an
+        array when horizon > 1), or with num_samples > 1 a dict with the
+        sample 'mean' and the requested 'quantiles' ({level: close}).
+        """
+        if self.conn is None:
+            self.conn = Client(self.address, authkey=self.authkey)
+        try:
+            self.conn.send({"ticker": ticker, "start_date": start_date, "end_date": end_date, "interval": interval,
+                            "horizon": horizon, "num_samples": num_samples, "quantiles": tuple(quantiles or ())})
+            reply = self.conn.recv()
+        except (EOFError, OSError):
+            self.close()
+            raise
+        if reply["error"]:
+            raise RuntimeError(reply["error"])
+        return reply["price"]
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the shared LSTM forecast server.")
+    parser.add_argument("--host", default=DEFAULT_ADDRESS[0])
+    parser.add_argument("--port", type=int, default=DEFAULT_ADDRESS[1])
+    parser.add_argument("--socket", help="Unix socket path (overrides --host/--port)")
+    parser.add_argument("--batch-window", type=float, default=0.05, help="Seconds to wait for more requests")
+    parser.add_argument("--torch-threads", type=int, default=None)
+    parser.add_argument("--refit-after-hours", type=float, default=0.0,
+                        help="Reuse a model trained up to this many hours before a window (-1: never refit)")
+    parser.add_argument("--max-models", type=int, default=4, help="Resident models per ticker and interval")
+    args = parser.parse_args()
+
+    address = args.socket or (args.host, args.port)
+    refit_after = None if args.refit_after_hours < 0 else timedelta(hours=args.refit_after_hours)
+    ForecastServer(address, batch_window=args.batch_window, torch_threads=args.torch_threads,
+                   refit_after=refit_after, max_models=args.max_models).serve_forever()
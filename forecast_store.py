@@ -0,0 +1,151 @@
+import os
+import glob
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+FORECAST_STORE_DIR = os.path.join("forecasts", "store")  # Parquet parts per ticker
+
+
+class ForecastStore:
+    """
+    Forecast rows indexed by (ticker, Datetime) in Parquet.
+
+    Each ticker owns a directory of append-only part files. Every part is
+    written sorted by Datetime, so reads only need to merge the parts and
+    drop timestamps that a later append has overwritten.
+    """
+
+    def __init__(self, root=FORECAST_STORE_DIR):
+        self.root = root
+
+    def _ticker_dir(self, ticker):
+        return os.path.join(self.root, ticker.upper())
+
+    def _parts(self, ticker):
+        return sorted(glob.glob(os.path.join(self._ticker_dir(ticker), "part-*.parquet")))
+
+    def has(self, ticker):
+        return len(self._parts(ticker)) > 0
+
+    def last_modified(self, ticker):
+        """Modification time of the newest part of a ticker, or None if nothing is stored."""
+        parts = self._parts(ticker)
+        return max(os.path.getmtime(part) for part in parts) if parts else None
+
+    def append(self, ticker, df):
+        """
+        Append forecast rows for a ticker.
+
+        Parameters:
+        ticker (str): Ticker symbol
+        df (pandas.DataFrame): Rows with a 'Datetime' column plus OHLCV columns
+
+        Returns:
+        str: Path of the part file written
+        """
+        if "Datetime" not in df.columns:
+            raise ValueError("Forecast rows need a 'Datetime' column")
+
+        df = df.drop(columns=["Source"], errors="ignore").copy()
+        df["Datetime"] = pd.to_datetime(df["Datetime"]).dt.tz_localize(None)
+        df = df.sort_values("Datetime", kind="mergesort")
+        df = df.drop_duplicates(subset="Datetime", keep="last")
+
+        ticker_dir = self._ticker_dir(ticker)
+        os.makedirs(ticker_dir, exist_ok=True)
+        part_path = os.path.join(ticker_dir, f"part-{len(self._parts(ticker)):06d}.parquet")
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), part_path)
+        return part_path
+
+    def read(self, ticker, start=None, end=None):
+        """
+        Read forecast rows for a ticker, optionally restricted to [start, end].
+
+        Row groups outside the range are skipped using Parquet statistics.
+        When the same timestamp appears in several parts, the latest append wins.
+
+        Returns:
+        pandas.DataFrame or None: Rows sorted by Datetime, or None if nothing is stored
+        """
+        parts = self._parts(ticker)
+        if not parts:
+            return None
+
+        filters = []
+        if start is not None:
+            filters.append(("Datetime", ">=", pd.Timestamp(start)))
+        if end is not None:
+            filters.append(("Datetime", "<=", pd.Timestamp(end)))
+
+        tables = [pq.read_table(part, filters=filters or None) for part in parts]
+        df = pa.concat_tables(tables, promote_options="default").to_pandas()
+
+        if len(parts) > 1:
+            # Stable sort keeps append order within equal timestamps
+            df = df.sort_values("Datetime", kind="mergesort")
+            df = df.drop_duplicates(subset="Datetime", keep="last")
+
+        df["Source"] = "Forecast"
+        return df.reset_index(drop=True)
+
+    def compact(self, ticker):
+        """Rewrite all parts of a ticker into a single deduplicated part."""
+        parts = self._parts(ticker)
+        if len(parts) <= 1:
+            return
+        df = self.read(ticker)
+        for part in parts:
+            os.remove(part)
+        self.append(ticker, df)
+
+    def import_csv(self, ticker, csv_path, replace=False):
+        """
+        Load a legacy `{ticker}_forecast_combined.csv` file into the store.
+        With replace=True the ticker's existing parts are dropped first, so
+        the store holds exactly the CSV's rows.
+        """
+        df = pd.read_csv(csv_path, parse_dates=["Datetime"])
+        if replace:
+            for part in self._parts(ticker):
+                os.remove(part)
+        return self.append(ticker, df)
+
+
+def merge_forecast(history, forecast):
+    """
+    Merge forecast rows into historical rows, both sorted by Datetime.
+
+    Historical rows win on overlapping timestamps. Forecast rows are slotted
+    into the historical order with a binary search instead of re-sorting the
+    combined frame.
+
+    Parameters:
+    history (pandas.DataFrame): Historical rows sorted by 'Datetime'
+    forecast (pandas.DataFrame): Forecast rows sorted by 'Datetime'
+
+    Returns:
+    pandas.DataFrame: Combined rows sorted by Datetime
+    """
+    hist_times = history["Datetime"].to_numpy(dtype="datetime64[ns]")
+    fc_times = forecast["Datetime"].to_numpy(dtype="datetime64[ns]")
+
+    pos = np.searchsorted(hist_times, fc_times)
+    if len(hist_times):
+        overlap = hist_times[np.minimum(pos, len(hist_times) - 1)] == fc_times
+    else:
+        overlap = np.zeros(len(fc_times), dtype=bool)
+    forecast = forecast[~overlap]
+    pos = pos[~overlap]
+
+    n_hist, n_fc = len(history), len(forecast)
+    hist_dest = np.arange(n_hist) + np.searchsorted(pos, np.arange(n_hist), side="right")
+    fc_dest = pos + np.arange(n_fc)
+
+    order = np.empty(n_hist + n_fc, dtype=np.int64)
+    order[hist_dest] = np.arange(n_hist)
+    order[fc_dest] = n_hist + np.arange(n_fc)
+
+    merged = pd.concat([history, forecast], ignore_index=True)
+    return merged.take(order).reset_index(drop=True)
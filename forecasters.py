@@ -0,0 +1,294 @@
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+
+from bars import load_history
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional
+    njit = None
+
+
+def forecast_metrics(actual, predicted):
+    """
+    Accuracy of predicted closes.
+
+    Returns:
+    dict: 'MAE', 'RMSE', 'MAPE [%]' and 'R²'
+    """
+    actual = np.asarray(actual, dtype=float)
+    error = actual - np.asarray(predicted, dtype=float)
+    return {
+        "MAE": np.abs(error).mean(),
+        "RMSE": np.sqrt((error ** 2).mean()),
+        "MAPE [%]": np.abs(error / actual).mean() * 100,
+        "R²": 1 - (error ** 2).sum() / ((actual - actual.mean()) ** 2).sum()
+    }
+
+
+class Forecaster(ABC):
+    """
+    Interface of the close-price forecasters the model wrappers can use.
+
+    fit(df) learns from a session-regular OHLCV frame (bars.load_history
+    output) and predict(df, horizon) returns the next `horizon` closes
+    after the last bar of df as a numpy array. Both are abstract, so a
+    subclass missing either fails when it is constructed.
+    """
+    name = None
+
+    @abstractmethod
+    def fit(self, df):
+        pass
+
+    @abstractmethod
+    def predict(self, df, horizon=1):
+        pass
+
+    def one_step(self, df, start):
+        """One-step-ahead forecasts of Close[start:], each made from the bars before it."""
+        return np.array([self.predict(df.iloc[:t])[0] for t in range(start, len(df))])
+
+
+class RidgeARForecaster(Forecaster):
+    """
+    Ridge regression of the next bar's log return on the last `lags` log
+    returns and the bar's High/Open/Low (relative to Close) and volume
+    change. Fits in closed form with NumPy.
+
+    Multi-step forecasts are recursive and hold the last bar's covariates,
+    like the LSTM's padded future covariates.
+    """
+    name = "ridge"
+
+    def __init__(self, lags=5, alpha=1.0):
+        self.lags = lags
+        self.alpha = alpha
+
+    def features(self, df):
+        """Feature rows aligned with df's bars (NaN until `lags` returns exist)."""
+        close = df['Close'].to_numpy(dtype=float)
+        returns = np.diff(np.log(close), prepend=np.nan)
+        lagged = [np.concatenate([np.full(k, np.nan), returns[:len(returns) - k]]) for k in range(self.lags)]
+        shape = [np.log(df[col].to_numpy(dtype=float) / close) for col in ('High', 'Open', 'Low')]
+        volume = np.diff(np.log1p(df['Volume'].to_numpy(dtype=float)), prepend=np.nan)
+        return np.column_stack(lagged + shape + [volume])
+
+    def fit(self, df):
+        x = self.features(df)[:-1]
+        y = np.diff(np.log(df['Close'].to_numpy(dtype=float)))
+        valid = ~np.isnan(x).any(axis=1)
+        x, y = x[valid], y[valid]
+
+        self.mean = x.mean(axis=0)
+        self.scale = np.where(x.std(axis=0) > 0, x.std(axis=0), 1.0)
+        xs = (x - self.mean) / self.scale
+        self.intercept = y.mean()
+        self.coef = np.linalg.solve(xs.T @ xs + self.alpha * np.eye(xs.shape[1]), xs.T @ (y - self.intercept))
+        return self
+
+    def _step(self, row):
+        return self.intercept + ((row - self.mean) / self.scale) @ self.coef
+
+    def predict(self, df, horizon=1):
+        row = self.features(df)[-1]
+        close = float(df['Close'].iloc[-1])
+        predicted = np.empty(horizon)
+        for h in range(horizon):
+            step = self._step(row)
+            close *= np.exp(step)
+            predicted[h] = close
+            # Roll the return lags; the held volume no longer changes
+            row = np.concatenate([[step], row[:self.lags - 1], row[self.lags:-1], [0.0]])
+        return predicted
+
+    def one_step(self, df, start):
+        x = self.features(df)[start - 1:-1]
+        close = df['Close'].to_numpy(dtype=float)[start - 1:-1]
+        return close * np.exp(self._step(x))
+
+
+def _holt_kernel(y, alpha, beta):
+    # Holt's linear trend; out[i] is the forecast of y[i] made after bar i - 1
+    n = y.shape[0]
+    out = np.empty(n)
+    level = y[0]
+    trend = 0.0
+    out[0] = y[0]
+    for i in range(1, n):
+        forecast = level + trend
+        out[i] = forecast
+        new_level = alpha * y[i] + (1.0 - alpha) * forecast
+        trend = beta * (new_level - level) + (1.0 - beta) * trend
+        level = new_level
+    return out, level, trend
+
+
+if njit is not None:
+    _holt_numba = njit(cache=True)(_holt_kernel)
+else:
+    _holt_numba = _holt_kernel
+
+
+class ExponentialSmoothingForecaster(Forecaster):
+    """
+    Holt's exponential smoothing of the close (level plus trend; beta=0 is
+    simple exponential smoothing). alpha and beta are picked by one-step
+    squared error over a small grid on the training bars.
+    """
+    name = "ets"
+
+    def __init__(self, alphas=None, betas=None):
+        self.alphas = np.linspace(0.05, 1.0, 20) if alphas is None else alphas
+        self.betas = (0.0, 0.01, 0.05, 0.1, 0.2) if betas is None else betas
+
+    def fit(self, df):
+        close = df['Close'].to_numpy(dtype=float)
+        best = None
+        for alpha in self.alphas:
+            for beta in self.betas:
+                out, _, _ = _holt_numba(close, float(alpha), float(beta))
+                sse = ((close[1:] - out[1:]) ** 2).sum()
+                if best is None or sse < best[0]:
+                    best = (sse, float(alpha), float(beta))
+        _, self.alpha, self.beta = best
+        return self
+
+    def predict(self, df, horizon=1):
+        _, level, trend = _holt_numba(df['Close'].to_numpy(dtype=float), self.alpha, self.beta)
+        return level + trend * np.arange(1, horizon + 1)
+
+    def one_step(self, df, start):
+        out, _, _ = _holt_numba(df['Close'].to_numpy(dtype=float), self.alpha, self.beta)
+        return out[start:]
+
+
+class LSTMForecaster(Forecaster):
+    """The darts LSTM of lstm_close behind the Forecaster interface."""
+    name = "lstm"
+
+    def __init__(self, ticker, interval="1h", use_best_config=True, global_model=None, accelerator="gpu"):
+        self.ticker = ticker
+        self.interval = interval
+        self.use_best_config = use_best_config
+        self.global_model = global_model
+        self.accelerator = accelerator
+
+    def fit(self, df):
+        from lstm_close import fit_model, ticker_bundle, check_after_training  # ✅ Only load torch/darts when the LSTM is used
+        if self.global_model is not None:
+            self.bundle = ticker_bundle(self.global_model, self.ticker)
+            check_after_training(self.bundle, df)
+        else:
+            self.bundle = fit_model(self.ticker, df, interval=self.interval, use_best_config=self.use_best_config,
+                                    accelerator=self.accelerator)
+        return self
+
+    def predict(self, df, horizon=1):
+        from lstm_close import forecast_batch
+        return forecast_batch(self.bundle, [df], horizon=horizon)[0]
+
+    def one_step(self, df, start):
+        # Every window is scored in one batched predict() call
+        from lstm_close import forecast_batch
+        length = self.bundle["model"].input_chunk_length
+        frames = [df.iloc[max(0, t - length):t] for t in range(start, len(df))]
+        return np.concatenate(forecast_batch(self.bundle, frames))
+
+
+FORECASTERS = {
+    "lstm": LSTMForecaster,
+    "ridge": RidgeARForecaster,
+    "ets": ExponentialSmoothingForecaster
+}
+
+
+def make_forecaster(forecaster, ticker=None, interval="1h", use_best_config=True, global_model=None):
+    """
+    Forecaster from a name in FORECASTERS (None means "lstm") or an
+    existing Forecaster instance, which is returned as is.
+    """
+    if isinstance(forecaster, Forecaster):
+        return forecaster
+    name = forecaster or "lstm"
+    if name not in FORECASTERS:
+        raise ValueError(f"Unknown forecaster '{name}'. Expected one of {list(FORECASTERS)}")
+    if name == "lstm":
+        return LSTMForecaster(ticker, interval, use_best_config=use_best_config, global_model=global_model)
+    return FORECASTERS[name]()
+
+
+def forecast_close(forecaster, ticker, start_date, end_date, interval="1h", horizon=1, data=None):
+    """
+    Fit a forecaster on the window and predict the next close(s), like
+    lstm_close.predict_stock.
+
+    Returns:
+    float or numpy.ndarray: Next close, or the next `horizon` closes
+    """
+    df = load_history(ticker, start_date, end_date, interval=interval, data=data)
+    if df is None:
+        return None
+
+    model = make_forecaster(forecaster, ticker, interval)
+    predicted = model.fit(df).predict(df, horizon=horizon)
+    if horizon == 1:
+        print(f"\n📈 Predicted next close price for {ticker} ({model.name}): ${predicted[0]:.2f}")
+        return float(predicted[0])
+    print(f"\n📈 Predicted next {horizon} close prices for {ticker} ({model.name}): "
+          + ", ".join(f"${p:.2f}" for p in predicted))
+    return predicted
+
+
+def evaluate_forecaster(forecaster, df, train_fraction=0.8):
+    """
+    Fit on the first train_fraction of bars and score one-step-ahead
+    forecasts of the remaining closes.
+
+    Returns:
+    dict: forecast_metrics plus 'Fit [s]' and 'Predict [ms/bar]'
+    """
+    train_size = int(len(df) * train_fraction)
+
+    start = time.perf_counter()
+    forecaster.fit(df.iloc[:train_size])
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    predicted = forecaster.one_step(df, train_size)
+    predict_time = time.perf_counter() - start
+
+    metrics = forecast_metrics(df['Close'].to_numpy(dtype=float)[train_size:], predicted)
+    metrics["Fit [s]"] = fit_time
+    metrics["Predict [ms/bar]"] = predict_time / max(len(predicted), 1) * 1000
+    return metrics
+
+
+def compare_forecasters(ticker, start_date, end_date, interval="1h", forecasters=("ridge", "ets", "lstm"),
+                        data=None, train_fraction=0.8):
+    """
+    Latency and accuracy of several forecasters on the same window and
+    train/validation split.
+
+    Returns:
+    pandas.DataFrame: One row of metrics per forecaster
+    """
+    df = load_history(ticker, start_date, end_date, interval=interval, data=data)
+    if df is None:
+        return None
+
+    results = {}
+    for forecaster in forecasters:
+        model = make_forecaster(forecaster, ticker, interval)
+        results[model.name] = evaluate_forecaster(model, df, train_fraction)
+    results = pd.DataFrame(results).T
+
+    print(f"\n[{ticker}] Forecaster comparison ({len(df) - int(len(df) * train_fraction)} validation bars):")
+    print("{:<10} ".format("Model") + " ".join("{:<18}".format(col) for col in results.columns))
+    for name, row in results.iterrows():
+        print("{:<10} ".format(name) + " ".join("{:<18.4f}".format(value) for value in row))
+
+    return results
@@ -2,54 +2,113 @@ from darts import TimeSeries
 from darts.models import RNNModel
 from darts.metrics import rmse, mape, mae
 from darts.utils.likelihood_models import GaussianLikelihood
-import yfinance as yf
 import pandas as pd
 from sklearn.preprocessing import MinMaxScaler
 import numpy as np
 from datetime import datetime, timedelta
 import os
 import json
+import pickle
+
+from dataset_store import DatasetStore, COVARIATE_COLS
+from market_calendar import next_sessions, future_bars
+from bars import INTERVALS, load_history
 
 from pytorch_lightning.callbacks import EarlyStopping
 
-# EarlyStopping callback
-early_stopping = EarlyStopping(
-    monitor="val_loss",
-    patience=5,
-    mode="min"
-)
+DEFAULT_QUANTILES = (0.1, 0.5, 0.9)  # Reported by probabilistic predictions (num_samples > 1)
 
-def predict_stock(ticker, start_date, end_date, interval="1h", use_best_config=True):
-    df = yf.download(ticker, start=start_date, end=end_date, interval=interval)
 
-    # ✅ Adjust OHLC based on Adj Close to correct for stock splits
-    if 'Adj Close' in df.columns and 'Close' in df.columns:
-        adjustment_factor = df["Adj Close"] / df["Close"]
-        df["Close"] = df["Adj Close"]
-        df["Open"] *= adjustment_factor
-        df["High"] *= adjustment_factor
-        df["Low"] *= adjustment_factor
+def make_early_stopping():
+    # A fresh callback per model, so long-lived processes don't share stopping state between fits
+    return EarlyStopping(
+        monitor="val_loss",
+        patience=5,
+        mode="min"
+    )
 
-    freq_map = {"15m": "15T", "30m": "30T", "1h": "H", "1d": "B"}
-    df.index = pd.DatetimeIndex(df.index)
 
-    if df.index.tz is None:
-        df.index = df.index.tz_localize("US/Eastern")
-    df.index = df.index.tz_convert("UTC").tz_localize(None)
+def build_model(ticker, use_best_config=True, accelerator="gpu"):
+    config_dir = "config"
+    os.makedirs(config_dir, exist_ok=True)
+    config_path = os.path.join(config_dir, f"{ticker.upper()}_close_lstm_config.json")
 
-    df = df.asfreq(freq_map.get(interval, "H"))
-    df = df.ffill()
+    if use_best_config and os.path.exists(config_path):
+        with open(config_path, "r") as f:
+            best_config = json.load(f)
+        print(f"✅ Loaded best hyperparameters from {config_path}")
+    else:
+        print("⚠️ Using default hardcoded config.")
 
-    if len(df) < 10:
-        print(f"⚠️ Not enough data ({len(df)} rows) for model training. Skipping...")
-        return None
+    return RNNModel(
+        model='LSTM',
+        input_chunk_length=48,
+        training_length=72,
+        output_chunk_length=1,
+        hidden_dim=32,
+        n_rnn_layers=2,
+        dropout=0.2,
+        batch_size=64,
+        n_epochs=100,
+        optimizer_kwargs={"lr": 1e-3},
+        likelihood=GaussianLikelihood(),
+        random_state=42,
+        model_name=f"LSTM_{ticker.upper()}",  # Own work dir, so concurrent fits do not reset each other
+        log_tensorboard=False,
+        force_reset=True,
+        save_checkpoints=False,
+        pl_trainer_kwargs={"accelerator": accelerator, "devices": 1, "callbacks": [make_early_stopping()]}
+    )
 
-    if df.empty:
-        print("⚠️ No data returned. Try adjusting date range or checking ticker.")
-        return None
 
+def to_series(frame, start=0):
+    """
+    darts series numbered by session bar rather than wall-clock time, so
+    consecutive trading bars are one step apart across nights, weekends
+    and holidays. `start` numbers the first row, keeping a validation
+    split aligned after its training part.
+    """
+    return TimeSeries.from_dataframe(frame.set_axis(pd.RangeIndex(start, start + len(frame))))
+
+
+def scale_frames(target, covariates, target_scaler, covariate_scaler):
+    target_scaled = pd.DataFrame(target_scaler.transform(target), columns=['Close'], index=target.index)
+    covariates_scaled = pd.DataFrame(covariate_scaler.transform(covariates), columns=COVARIATE_COLS, index=covariates.index)
+    return target_scaled, covariates_scaled
+
+
+def pad_future_covariates(covariates_scaled, interval, periods=1, future_scaled=None):
+    """
+    Extend scaled covariates over the bars being predicted.
+
+    Known future rows (already scaled) are used first, matched by time or
+    by position as in market_calendar.future_bars; any remaining bars
+    repeat the last known covariate row.
+    """
+    step = INTERVALS.get(interval, INTERVALS["1h"])
+    parts = [covariates_scaled]
+    if future_scaled is not None and len(future_scaled):
+        future_scaled = future_bars(future_scaled, covariates_scaled.index[-1], periods, step)
+        parts.append(future_scaled)
+        periods -= len(future_scaled)
+
+    if periods > 0:
+        last = parts[-1]
+        future_index = next_sessions(last.index[-1], periods, step)
+        last_row = last.iloc[-1]
+        parts.append(pd.DataFrame([last_row.values] * periods, columns=covariates_scaled.columns, index=future_index))
+    return pd.concat(parts)
+
+
+def split_and_scale(df, interval="1h", embedding=None):
+    """
+    80/20 train/validation split of df with scalers fitted on the train part.
+
+    Returns:
+    tuple: (train_y, train_x, val_y, val_x, target_scaler, covariate_scaler, train_size)
+    """
     target_series = df[['Close']]
-    covariates = df[['High', 'Open', 'Low', 'Volume']]
+    covariates = df[COVARIATE_COLS]
 
     train_size = int(len(df) * 0.8)
     train_target = target_series[:train_size]
@@ -59,86 +118,39 @@ def predict_stock(ticker, start_date, end_date, interval="1h", use_best_config=T
 
     target_scaler = MinMaxScaler()
     covariate_scaler = MinMaxScaler()
+    target_scaler.fit(train_target)
+    covariate_scaler.fit(train_covariates)
 
-    train_target_scaled = pd.DataFrame(target_scaler.fit_transform(train_target), columns=['Close'], index=train_target.index)
-    train_covariates_scaled = pd.DataFrame(covariate_scaler.fit_transform(train_covariates), columns=['High', 'Open', 'Low', 'Volume'], index=train_covariates.index)
-    test_target_scaled = pd.DataFrame(target_scaler.transform(test_target), columns=['Close'], index=test_target.index)
-    test_covariates_scaled = pd.DataFrame(covariate_scaler.transform(test_covariates), columns=['High', 'Open', 'Low', 'Volume'], index=test_covariates.index)
-
-    last_index_time = df.index[-1]
-    last_row = test_covariates_scaled.iloc[-1]
-    future_index = pd.date_range(
-        start=last_index_time + pd.tseries.frequencies.to_offset(freq_map.get(interval, "H")),
-        periods=1,
-        freq=freq_map.get(interval, "H")
-    )
-    future_rows = pd.DataFrame([last_row.values], columns=test_covariates_scaled.columns, index=future_index)
-    test_covariates_scaled = pd.concat([test_covariates_scaled, future_rows])
+    train_target_scaled, train_covariates_scaled = scale_frames(train_target, train_covariates, target_scaler, covariate_scaler)
+    test_target_scaled, test_covariates_scaled = scale_frames(test_target, test_covariates, target_scaler, covariate_scaler)
+    test_covariates_scaled = pad_future_covariates(test_covariates_scaled, interval)
 
-    train_y = TimeSeries.from_dataframe(train_target_scaled, freq=freq_map.get(interval, "H"))
-    test_y = TimeSeries.from_dataframe(test_target_scaled, freq=freq_map.get(interval, "H"))
-    train_x = TimeSeries.from_dataframe(train_covariates_scaled, freq=freq_map.get(interval, "H"))
-    test_x = TimeSeries.from_dataframe(test_covariates_scaled, freq=freq_map.get(interval, "H"))
+    train_y = to_series(train_target_scaled)
+    test_y = to_series(test_target_scaled, start=train_size)
+    train_x = to_series(add_embedding(train_covariates_scaled, embedding))
+    test_x = to_series(add_embedding(test_covariates_scaled, embedding), start=train_size)
 
-    # ✅ Validation split (last 10% of training)
-    val_split_idx = int(len(train_y) * 0.9)
-    real_train_y = train_y[:val_split_idx]
-    val_y = train_y[val_split_idx:]
-    real_train_x = train_x[:val_split_idx]
-    val_x = train_x[val_split_idx:]
+    return train_y, train_x, test_y, test_x, target_scaler, covariate_scaler, train_size
 
-    config_dir = "config"
-    os.makedirs(config_dir, exist_ok=True)
-    config_path = os.path.join(config_dir, f"{ticker.upper()}_close_lstm_config.json")
 
-    if use_best_config and os.path.exists(config_path):
-        with open(config_path, "r") as f:
-            best_config = json.load(f)
-        print(f"✅ Loaded best hyperparameters from {config_path}")
+def add_embedding(covariates_scaled, embedding):
+    # RNNModel has no static covariates, so a ticker's one-hot code rides along as constant covariate columns
+    if embedding is None:
+        return covariates_scaled
+    return covariates_scaled.assign(**embedding.to_dict())
 
-        model = RNNModel(
-            model='LSTM',
-            input_chunk_length=48,
-            training_length=72,
-            output_chunk_length=1,
-            hidden_dim=32,
-            n_rnn_layers=2,
-            dropout=0.2,
-            batch_size=64,
-            n_epochs=100,
-            optimizer_kwargs={"lr": 1e-3},
-            likelihood=GaussianLikelihood(),
-            random_state=42,
-            model_name="LSTM_Model",
-            log_tensorboard=False,
-            force_reset=True,
-            save_checkpoints=False,
-            pl_trainer_kwargs={"accelerator": "gpu", "devices": 1, "callbacks": [early_stopping]}
-        )
-
-#, "callbacks": [early_stopping]
-    else:
-        print("⚠️ Using default hardcoded config.")
-        model = RNNModel(
-            model='LSTM',
-            input_chunk_length=48,
-            training_length=72,
-            output_chunk_length=1,
-            hidden_dim=32,
-            n_rnn_layers=2,
-            dropout=0.2,
-            batch_size=64,
-            n_epochs=100,
-            optimizer_kwargs={"lr": 1e-3},
-            likelihood=GaussianLikelihood(),
-            random_state=42,
-            model_name="LSTM_Model",
-            log_tensorboard=False,
-            force_reset=True,
-            save_checkpoints=False,
-            pl_trainer_kwargs={"accelerator": "gpu", "devices": 1, "callbacks": [early_stopping]}
-        )
 
+def fit_model(ticker, df, interval="1h", use_best_config=True, accelerator="gpu"):
+    """
+    Fit scalers and an LSTM on an 80/20 train/validation split of df.
+
+    Returns:
+    dict: Fitted model bundle ('model', scalers, and the 'recent' validation
+          bars that predict_stock forecasts from)
+    """
+    train_y, train_x, test_y, test_x, target_scaler, covariate_scaler, train_size = split_and_scale(df, interval)
+
+    model = build_model(ticker, use_best_config, accelerator)
     model.fit(
         series=train_y,
         future_covariates=train_x,
@@ -147,16 +159,367 @@ def predict_stock(ticker, start_date, end_date, interval="1h", use_best_config=T
         verbose=True
     )
 
+    return {
+        "ticker": ticker,
+        "interval": interval,
+        "model": model,
+        "target_scaler": target_scaler,
+        "covariate_scaler": covariate_scaler,
+        "recent": df[train_size:],
+        "last_time": df.index[-1]
+    }
+
+
+def fit_global_model(tickers, start_date, end_date, interval="1h", use_embeddings=True, data=None):
+    """
+    Fit one LSTM across a universe of tickers; darts trains on the list of
+    per-ticker series, so the model is fitted once and then serves every
+    ticker in the set without retraining.
+
+    Each ticker keeps its own scalers, so prices of different magnitudes
+    share the [0, 1] range. With use_embeddings a one-hot ticker code is
+    appended to the future covariates.
+
+    Parameters:
+    tickers (list): Ticker symbols to train on
+    data (dict): Optional {ticker: DataFrame with 'Datetime'} of already fetched bars
+
+    Returns:
+    dict: Global model bundle; pass it as predict_stock(..., global_model=bundle)
+    """
+    frames = {}
+    for ticker in tickers:
+        df = load_history(ticker, start_date, end_date, interval=interval, data=(data or {}).get(ticker))
+        if df is not None:
+            frames[ticker.upper()] = df
+    if not frames:
+        raise ValueError("None of the tickers had enough data to train a global model")
+
+    names = sorted(frames)
+    columns = [f"Ticker_{name}" for name in names]
+    embeddings = {
+        name: pd.Series(np.eye(len(names))[i], index=columns) if use_embeddings else None
+        for i, name in enumerate(names)
+    }
+
+    train_y, train_x, val_y, val_x = [], [], [], []
+    scalers, recent = {}, {}
+    for name in names:
+        ty, tx, vy, vx, target_scaler, covariate_scaler, train_size = split_and_scale(frames[name], interval, embeddings[name])
+        train_y.append(ty)
+        train_x.append(tx)
+        val_y.append(vy)
+        val_x.append(vx)
+        scalers[name] = (target_scaler, covariate_scaler)
+        recent[name] = frames[name][train_size:]
+
+    print(f"🌐 Fitting global model on {len(names)} tickers: {', '.join(names)}")
+    model = build_model("GLOBAL", use_best_config=False)
+    model.fit(
+        series=train_y,
+        future_covariates=train_x,
+        val_series=val_y,
+        val_future_covariates=val_x,
+        verbose=True
+    )
+
+    return {
+        "tickers": names,
+        "interval": interval,
+        "model": model,
+        "scalers": scalers,
+        "embeddings": embeddings,
+        "recent": recent
+    }
+
+
+def ticker_bundle(global_model, ticker):
+    """Per-ticker view of a global model bundle, usable with forecast_batch."""
+    name = ticker.upper()
+    if name not in global_model["scalers"]:
+        raise ValueError(f"{ticker} is not in the global model's universe {global_model['tickers']}")
+    target_scaler, covariate_scaler = global_model["scalers"][name]
+    return {
+        "ticker": name,
+        "interval": global_model["interval"],
+        "model": global_model["model"],
+        "target_scaler": target_scaler,
+        "covariate_scaler": covariate_scaler,
+        "embedding": global_model["embeddings"][name],
+        "recent": global_model["recent"][name],
+        "last_time": global_model["recent"][name].index[-1]
+    }
+
+
+def check_after_training(bundle, df):
+    """
+    Refuse to score bars a bundle was trained on: a window ending before the
+    bundle's last training bar would be forecast with knowledge of its future.
+    """
+    if df.index[-1] < bundle["last_time"]:
+        raise ValueError(f"Look-ahead: the window for {bundle['ticker']} ends at {df.index[-1]}, before the "
+                         f"model's training data ({bundle['last_time']}); use a model fitted before the window")
+
+
+def save_bundle(bundle, path):
+    """
+    Persist a fitted model bundle in directory `path`: the darts model
+    (model.pt plus its .ckpt weights, saved clean of trainer state) and the
+    scalers and recent bars (bundle.pkl). Reload it with load_bundle.
+    """
+    os.makedirs(path, exist_ok=True)
+    bundle["model"].save(os.path.join(path, "model.pt"), clean=True)
+    with open(os.path.join(path, "bundle.pkl"), "wb") as f:
+        pickle.dump({key: value for key, value in bundle.items() if key != "model"}, f)
+
+
+def load_bundle(path, map_location="cpu"):
+    """Model bundle written by save_bundle, ready for forecast_batch."""
+    with open(os.path.join(path, "bundle.pkl"), "rb") as f:
+        bundle = pickle.load(f)
+    bundle["model"] = RNNModel.load(os.path.join(path, "model.pt"), map_location=map_location)
+    return bundle
+
+
+def preprocess_to_store(ticker, start_date, end_date, interval="1h", store=None, data=None):
+    """
+    Load, regularise and scale a ticker's history once and persist it in a
+    memory-mapped DatasetStore, so later fits and forecasts skip the pandas,
+    scaler and TimeSeries preparation.
+
+    Returns:
+    dataset_store.StoredDataset: The stored dataset, or None if there was too little data
+    """
+    df = load_history(ticker, start_date, end_date, interval=interval, data=data)
+    if df is None:
+        return None
+    return (store or DatasetStore()).write(ticker, interval, df, start_date=start_date, end_date=end_date)
+
+
+def ensure_stored(ticker, start_date, end_date, interval="1h", store=None, data=None):
+    """
+    Stored dataset covering [start_date, end_date). A window reaching outside
+    the stored range (e.g. a later signal in a backtest) re-preprocesses
+    the union of both ranges, so no window is served from stale bars.
+
+    Returns:
+    dataset_store.StoredDataset: The covering dataset, or None if there was too little data
+    """
+    store = store or DatasetStore()
+    if store.has(ticker, interval):
+        dataset = store.open(ticker, interval)
+        if dataset.covers(start_date, end_date):
+            return dataset
+        if "start_date" in dataset.meta:
+            start_date = min(pd.Timestamp(start_date), pd.Timestamp(dataset.meta["start_date"]))
+            end_date = max(pd.Timestamp(end_date), pd.Timestamp(dataset.meta["end_date"]))
+        print(f"🔄 Extending stored {ticker.upper()} ({interval}) dataset to {start_date} → {end_date}")
+    return preprocess_to_store(ticker, start_date, end_date, interval, store=store, data=data)
+
+
+def fit_model_from_store(ticker, interval="1h", store=None, start_date=None, end_date=None, use_best_config=True):
+    """
+    Fit an LSTM on windows read straight from a DatasetStore, with the same
+    80/20 train/validation split of the [start_date, end_date) bars as
+    fit_model and scalers fitted on this window's train part only. Inputs
+    match fit_model on the same window up to the store's float32 rounding.
+
+    Returns:
+    dict: Fitted model bundle, forecast with forecast_from_store
+    """
+    dataset = (store or DatasetStore()).open(ticker, interval)
+    start, end = dataset.positions(start_date, end_date)
+    split = start + int((end - start) * 0.8)
+
+    scalers = dataset.fit_scalers(start, split)
+
+    model = build_model(ticker, use_best_config)
+    model.fit_from_dataset(
+        dataset.training_dataset(model.training_length, scalers, start, split),
+        val_dataset=dataset.training_dataset(model.training_length, scalers, split, end),
+        verbose=True
+    )
+
+    return {
+        "ticker": ticker,
+        "interval": interval,
+        "model": model,
+        "target_scaler": scalers[0],
+        "covariate_scaler": scalers[1],
+        "dataset": dataset,
+        "end": end,
+        "last_time": pd.Timestamp(int(dataset.times[end - 1]))
+    }
+
+
+def forecast_from_store(bundle, end=None, horizon=1, num_samples=1):
+    """
+    Predict the `horizon` closes after stored position `end` (default: the
+    fitted window's end). With num_samples > 1 the sample paths come back
+    as in forecast_batch.
+    """
+    model = bundle["model"]
+    series, covariates = bundle["dataset"].inference_series(end or bundle["end"], model.input_chunk_length,
+                                                            (bundle["target_scaler"], bundle["covariate_scaler"]), horizon)
+    prediction = model.predict(n=horizon, series=series, future_covariates=covariates, num_samples=num_samples)
+    if num_samples > 1:
+        return inverse_transform_samples(bundle, prediction)
+    return inverse_transform_values(bundle, prediction)
+
+
+def inverse_transform_values(bundle, scaled_series):
+    scaled_values = scaled_series.values().flatten()
+    return bundle["target_scaler"].inverse_transform(scaled_values.reshape(-1, 1)).flatten()
+
+
+def inverse_transform_samples(bundle, scaled_series):
+    """Unscaled sample paths of a probabilistic prediction, shaped (horizon, num_samples)."""
+    samples = scaled_series.all_values()[:, 0, :]
+    return bundle["target_scaler"].inverse_transform(samples.reshape(-1, 1)).reshape(samples.shape)
+
+
+def summarize_samples(samples, quantiles=DEFAULT_QUANTILES):
+    """
+    Mean and quantiles of sampled closes.
+
+    Parameters:
+    samples (numpy.ndarray): Sample paths shaped (horizon, num_samples)
+    quantiles (tuple): Quantile levels in (0, 1)
+
+    Returns:
+    dict: 'mean' and 'quantiles' ({level: values}), each with one value per forecast bar
+    """
+    return {
+        "mean": samples.mean(axis=1),
+        "quantiles": {q: np.quantile(samples, q, axis=1) for q in quantiles}
+    }
+
+
+def scale_future_covariates(bundle, future_covariates):
+    """
+    Scale caller-supplied future covariates (High/Open/Low/Volume) with the
+    bundle's covariate scaler. Accepts a DataFrame or a darts TimeSeries,
+    indexed by bar time or by position (see market_calendar.future_bars);
+    the index is kept as is.
+    """
+    if future_covariates is None:
+        return None
+    if isinstance(future_covariates, TimeSeries):
+        future_covariates = future_covariates.to_dataframe() if hasattr(future_covariates, "to_dataframe") else future_covariates.pd_dataframe()
+    future_covariates = future_covariates[COVARIATE_COLS]
+    return pd.DataFrame(bundle["covariate_scaler"].transform(future_covariates),
+                        columns=COVARIATE_COLS, index=future_covariates.index)
+
+
+def prepare_inputs(bundle, df, horizon=1, future_covariates=None):
+    """Scale recent bars with the bundle's fitted scalers into predict() inputs."""
+    target_scaled, covariates_scaled = scale_frames(df[['Close']], df[COVARIATE_COLS],
+                                                    bundle["target_scaler"], bundle["covariate_scaler"])
+    covariates_scaled = pad_future_covariates(covariates_scaled, bundle["interval"], periods=horizon,
+                                              future_scaled=scale_future_covariates(bundle, future_covariates))
+    covariates_scaled = add_embedding(covariates_scaled, bundle.get("embedding"))
+    return to_series(target_scaled), to_series(covariates_scaled)
+
+
+def forecast_batch(bundle, frames, horizon=1, future_covariates=None, num_samples=1):
+    """
+    Predict the next `horizon` closes after each frame of recent bars with
+    one predict() call, reusing the bundle's fitted model and scalers.
+
+    RNNModel always has output_chunk_length=1 and rolls its hidden state
+    forward, so predict(n=horizon) produces every step in the same call.
+    With num_samples > 1 the model's GaussianLikelihood is sampled instead:
+    darts draws all sample paths of all frames in the same batched forward
+    passes, so many samples cost about one inference.
+
+    Parameters:
+    future_covariates (list): Optional known future covariates per frame
+                              (DataFrame or TimeSeries, unscaled); missing
+                              bars repeat the last known row
+    num_samples (int): Sample paths to draw per frame
+
+    Returns:
+    list: numpy arrays of `horizon` predicted closes, one per frame
+          (shaped (horizon, num_samples) when num_samples > 1)
+    """
+    future_covariates = future_covariates or [None] * len(frames)
+    inputs = [prepare_inputs(bundle, df, horizon, future) for df, future in zip(frames, future_covariates)]
+    predictions = bundle["model"].predict(
+        n=horizon,
+        series=[series for series, _ in inputs],
+        future_covariates=[covariates for _, covariates in inputs],
+        num_samples=num_samples
+    )
+    if num_samples > 1:
+        return [inverse_transform_samples(bundle, pred) for pred in predictions]
+    return [inverse_transform_values(bundle, pred) for pred in predictions]
+
+
+def predict_stock(ticker, start_date, end_date, interval="1h", use_best_config=True, data=None,
+                  horizon=1, future_covariates=None, global_model=None, dataset_store=None, num_samples=1,
+                  quantiles=DEFAULT_QUANTILES):
+    """
+    Fit an LSTM on the window and forecast the next close.
+
+    With horizon > 1 the next `horizon` closes come back as a numpy array
+    from a single predict() call; future_covariates can supply known
+    High/Open/Low/Volume values for those bars. Given a global_model from
+    fit_global_model, nothing is trained: the window is only scored, and a
+    window ending before the global model's training data raises ValueError.
+    With a dataset_store, training and inference read the memory-mapped
+    arrays (the window is stored first if it is not covered yet; use
+    preprocess_to_store over the full range to share one store).
+
+    With num_samples > 1 the forecast is probabilistic: that many paths are
+    sampled in one batched predict() call and summarized as a dict with the
+    sample 'mean' and the requested 'quantiles' ({level: close}), each a
+    float (horizon=1) or an array of `horizon` closes.
+    """
+    if dataset_store is not None:
+        if ensure_stored(ticker, start_date, end_date, interval, store=dataset_store, data=data) is None:
+            return None
+        bundle = fit_model_from_store(ticker, interval, store=dataset_store, start_date=start_date,
+                                      end_date=end_date, use_best_config=use_best_config)
+        predicted = forecast_from_store(bundle, horizon=horizon, num_samples=num_samples)
+        return report_prediction(ticker, predicted, horizon, quantiles)
+
+    df = load_history(ticker, start_date, end_date, interval=interval, data=data)
+    if df is None:
+        return None
+
+    if global_model is not None:
+        bundle = ticker_bundle(global_model, ticker)
+        check_after_training(bundle, df)
+        recent = df
+    else:
+        bundle = fit_model(ticker, df, interval=interval, use_best_config=use_best_config)
+        recent = bundle["recent"]
+    predicted = forecast_batch(bundle, [recent], horizon=horizon, future_covariates=[future_covariates],
+                               num_samples=num_samples)[0]
+    return report_prediction(ticker, predicted, horizon, quantiles)
+
+
+def report_prediction(ticker, predicted, horizon, quantiles=DEFAULT_QUANTILES):
+    if predicted.ndim == 2:
+        return report_distribution(ticker, summarize_samples(predicted, quantiles), horizon)
+
+    if horizon == 1:
+        predicted_price = float(predicted[0])
+        print(f"\n📈 Predicted next close price for {ticker}: ${predicted_price:.2f}")
+        return predicted_price
 
-    future_pred = model.predict(n=1, series=test_y, future_covariates=test_x)
+    print(f"\n📈 Predicted next {horizon} close prices for {ticker}: " + ", ".join(f"${p:.2f}" for p in predicted))
+    return predicted
 
-    def inverse_transform_series(scaled_series):
-        scaled_values = scaled_series.values().flatten()
-        inverse_transformed = target_scaler.inverse_transform(scaled_values.reshape(-1, 1)).flatten()
-        return TimeSeries.from_times_and_values(times=scaled_series.time_index, values=inverse_transformed)
 
-    future_pred = inverse_transform_series(future_pred)
-    predicted_price = float(future_pred.values().flatten()[0])
+def report_distribution(ticker, summary, horizon):
+    bands = ", ".join(f"q{q:g}=${v[-1]:.2f}" for q, v in summary["quantiles"].items())
+    if horizon == 1:
+        summary = {"mean": float(summary["mean"][0]),
+                   "quantiles": {q: float(v[0]) for q, v in summary["quantiles"].items()}}
+        print(f"\n📈 Predicted next close price for {ticker}: ${summary['mean']:.2f} ({bands})")
+        return summary
 
-    print(f"\n📈 Predicted next close price for {ticker}: ${predicted_price:.2f}")
-    return predicted_price
+    print(f"\n📈 Predicted next {horizon} close prices for {ticker}: "
+          + ", ".join(f"${p:.2f}" for p in summary["mean"]) + f" (last bar: {bands})")
+    return summary
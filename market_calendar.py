@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar,
+    Holiday,
+    GoodFriday,
+    USMartinLutherKingJr,
+    USPresidentsDay,
+    USMemorialDay,
+    USLaborDay,
+    USThanksgivingDay,
+    nearest_workday,
+    sunday_to_monday
+)
+
+# Regular US equity session in exchange-local (US/Eastern) wall time,
+# which is what fetch_data returns after dropping the timezone.
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=30)
+SESSION_CLOSE = pd.Timedelta(hours=16)
+EXCHANGE_TZ = "US/Eastern"
+
+# Unscheduled full-day NYSE closures
+SPECIAL_CLOSURES = pd.DatetimeIndex([
+    "2001-09-11", "2001-09-12", "2001-09-13", "2001-09-14",  # September 11
+    "2004-06-11",  # President Reagan's funeral
+    "2007-01-02",  # President Ford's funeral
+    "2012-10-29", "2012-10-30",  # Hurricane Sandy
+    "2018-12-05",  # President G. H. W. Bush's funeral
+    "2025-01-09",  # President Carter's funeral
+])
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """
+    Scheduled full-day NYSE holidays. Early closes (e.g. the day after
+    Thanksgiving) are treated as full sessions.
+    """
+    rules = [
+        # A Saturday New Year's Day is not observed on the Friday before
+        Holiday("New Year's Day", month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday("Juneteenth", month=6, day=19, start_date="2022-01-01", observance=nearest_workday),
+        Holiday("Independence Day", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas Day", month=12, day=25, observance=nearest_workday)
+    ]
+
+
+def holidays(start, end):
+    """Weekday dates in [start, end] on which the exchange is closed."""
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+    scheduled = NYSEHolidayCalendar().holidays(start, end)
+    special = SPECIAL_CLOSURES[(SPECIAL_CLOSURES >= start) & (SPECIAL_CLOSURES <= end)]
+    return scheduled.union(special)
+
+
+def trading_days(start, end):
+    """Trading dates in [start, end]."""
+    days = pd.bdate_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize())
+    return days[~days.isin(holidays(start, end))]
+
+
+def session_mask(times, session_open=SESSION_OPEN, session_close=SESSION_CLOSE, exclude_holidays=True):
+    """
+    Boolean mask of timestamps inside the regular session.
+
+    Parameters:
+    times (pandas.DatetimeIndex or pandas.Series): Naive exchange-local timestamps
+    exclude_holidays (bool): Also mask out exchange holidays
+
+    Returns:
+    numpy.ndarray: True where the bar starts within [open, close) on a trading day
+    """
+    times = pd.DatetimeIndex(times)
+    offset = times - times.normalize()
+    mask = (offset >= session_open) & (offset < session_close) & (times.dayofweek < 5)
+    if exclude_holidays and len(times):
+        mask &= ~times.normalize().isin(holidays(times.min(), times.max()))
+    return np.asarray(mask)
+
+
+def session_index(start, end, step, session_open=SESSION_OPEN, session_close=SESSION_CLOSE):
+    """
+    Start times of every regular-session bar of length `step` within
+    [start, end]: 09:30, 10:30, ... 15:30 for hourly bars. Daily or longer
+    steps give the trading dates.
+
+    Returns:
+    pandas.DatetimeIndex: Naive exchange-local bar start times
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    days = trading_days(start, end)
+    if step >= pd.Timedelta(days=1):
+        return days[(days >= start.normalize()) & (days <= end)]
+
+    offsets = pd.timedelta_range(session_open, session_close - pd.Timedelta(1), freq=step)
+    times = pd.DatetimeIndex((days.values[:, None] + offsets.values[None, :]).ravel())
+    return times[(times >= start) & (times <= end)]
+
+
+def next_sessions(after, periods, step, session_open=SESSION_OPEN, session_close=SESSION_CLOSE):
+    """The `periods` regular-session bar start times following `after`."""
+    after = pd.Timestamp(after)
+    bars_per_day = 1 if step >= pd.Timedelta(days=1) else int(-(-(session_close - session_open) // step))
+    # Calendar days that surely contain enough trading days, allowing for weekends and holidays
+    days_ahead = int(np.ceil(periods / bars_per_day * 7 / 5)) + 7
+    times = session_index(after, after.normalize() + pd.Timedelta(days=days_ahead), step, session_open, session_close)
+    return times[times > after][:periods]
+
+
+def future_bars(frame, after, periods, step, session_open=SESSION_OPEN, session_close=SESSION_CLOSE):
+    """
+    The first `periods` rows of frame for the bars following `after`,
+    indexed by their bar start times.
+
+    A DatetimeIndex is matched by time (tz-aware times are converted to
+    exchange-local wall time first). An integer index, such as a darts
+    series numbered by bar, is taken by position: row k is the k-th session
+    bar after `after`.
+    """
+    index = frame.index
+    if isinstance(index, pd.DatetimeIndex):
+        if index.tz is not None:
+            frame = frame.set_axis(index.tz_convert(EXCHANGE_TZ).tz_localize(None))
+        return frame[frame.index > pd.Timestamp(after)].iloc[:periods]
+    if pd.api.types.is_integer_dtype(index):
+        frame = frame.sort_index().iloc[:periods]
+        return frame.set_axis(next_sessions(after, len(frame), step, session_open, session_close))
+    raise ValueError(f"Future covariates need a DatetimeIndex of bar times or an integer (positional) index, "
+                     f"got {type(index).__name__}")
+
+
+def regularize_sessions(df, step, session_open=SESSION_OPEN, session_close=SESSION_CLOSE):
+    """
+    Put bars on the trading-session grid between their first and last bar.
+
+    Bars missing inside a session are forward-filled; nights, weekends and
+    holidays are dropped rather than padded, so consecutive rows are
+    consecutive trading bars.
+
+    Parameters:
+    df (pandas.DataFrame): Bars indexed by naive exchange-local time
+    step (pandas.Timedelta): Bar length
+
+    Returns:
+    pandas.DataFrame: Bars indexed by session bar start time
+    """
+    df = df[~df.index.duplicated(keep="first")].sort_index()
+    if df.empty:
+        return df
+    if step >= pd.Timedelta(days=1):
+        df = df.set_axis(df.index.normalize())
+        df = df[~df.index.duplicated(keep="last")]
+    grid = session_index(df.index[0], df.index[-1], step, session_open, session_close)
+    return df.reindex(grid).ffill()
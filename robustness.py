@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+
+from strategies.macd import MACDStrategy
+from strategies.bollinger import BollingerBandsStrategy
+from strategies.cci import CCI_Strategy
+from strategies.adx import ADXStrategy
+from strategies.obv import OBVStrategy
+from strategies.backend import shift, dema, rolling_mean, rolling_std, obv, directional_movement
+from simulator import simulate_batch
+
+
+def _bar_ratios(df):
+    """Each bar's Open/High/Low/Close relative to the previous Close."""
+    prev_close = df['Close'].to_numpy(dtype=float)[:-1]
+    return {
+        col: df[col].to_numpy(dtype=float)[1:] / prev_close
+        for col in ("Open", "High", "Low", "Close")
+    }
+
+
+def _rebuild_paths(first_close, ratios, volume):
+    close = first_close * np.cumprod(ratios["Close"], axis=1)
+    prev_close = np.concatenate([np.full((close.shape[0], 1), first_close), close[:, :-1]], axis=1)
+    paths = {col: prev_close * ratios[col] for col in ("Open", "High", "Low")}
+    paths["Close"] = close
+    paths["Volume"] = volume
+    return paths
+
+
+def block_bootstrap_paths(df, n_paths, block_size=24, seed=None):
+    """
+    Resample whole blocks of bars (relative to the previous close) to build
+    alternative price histories that keep short-range autocorrelation and
+    intrabar shape.
+
+    Returns:
+    dict: 'Open', 'High', 'Low', 'Close', 'Volume' arrays of shape (n_paths, len(df) - 1)
+    """
+    rng = np.random.default_rng(seed)
+    ratios = _bar_ratios(df)
+    volume = df['Volume'].to_numpy(dtype=float)[1:]
+    n_bars = len(volume)
+    block_size = min(block_size, n_bars)
+
+    n_blocks = -(-n_bars // block_size)
+    starts = rng.integers(0, n_bars - block_size + 1, size=(n_paths, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block_size)).reshape(n_paths, -1)[:, :n_bars]
+
+    first_close = float(df['Close'].iloc[0])
+    return _rebuild_paths(first_close, {col: r[idx] for col, r in ratios.items()}, volume[idx])
+
+
+def noise_paths(df, n_paths, noise_std=0.001, seed=None):
+    """
+    Perturb every bar's close-to-close log return with Gaussian noise,
+    keeping each bar's Open/High/Low relative to its Close.
+
+    Returns:
+    dict: 'Open', 'High', 'Low', 'Close', 'Volume' arrays of shape (n_paths, len(df) - 1)
+    """
+    rng = np.random.default_rng(seed)
+    ratios = _bar_ratios(df)
+    volume = df['Volume'].to_numpy(dtype=float)[1:]
+    n_bars = len(volume)
+
+    noisy_close = ratios["Close"] * np.exp(rng.normal(0.0, noise_std, size=(n_paths, n_bars)))
+    noisy = {col: ratios[col] / ratios["Close"] * noisy_close for col in ("Open", "High", "Low")}
+    noisy["Close"] = noisy_close
+
+    first_close = float(df['Close'].iloc[0])
+    return _rebuild_paths(first_close, noisy, np.broadcast_to(volume, (n_paths, n_bars)))
+
+
+def batched_signals(strategy, paths):
+    """
+    Buy/sell signals of a strategy on every path at once, using the NumPy
+    indicator backend along the bar axis.
+
+    Returns:
+    tuple: (buy, sell) boolean arrays of shape (paths, bars)
+    """
+    close = paths["Close"]
+
+    if isinstance(strategy, MACDStrategy):
+        macd = dema(close, strategy.fast_length, "numpy") - dema(close, strategy.slow_length, "numpy")
+        signal = dema(macd, strategy.signal_length, "numpy")
+        prev_macd, prev_signal = shift(macd), shift(signal)
+        buy = (macd > signal) & (prev_macd <= prev_signal)
+        sell = (macd < signal) & (prev_macd >= prev_signal)
+
+    elif isinstance(strategy, BollingerBandsStrategy):
+        mean = rolling_mean(close, strategy.length, min_periods=1, backend="numpy")
+        std = rolling_std(close, strategy.length, min_periods=1, backend="numpy")
+        buy = close < mean - std * strategy.std_dev_multiplier
+        sell = close > mean + std * strategy.std_dev_multiplier
+
+    elif isinstance(strategy, CCI_Strategy):
+        typical = (paths["High"] + paths["Low"] + close) / 3
+        sma = rolling_mean(typical, strategy.length, min_periods=1, backend="numpy")
+        deviation = rolling_mean(np.abs(typical - sma), strategy.length, min_periods=1, backend="numpy")
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cci = (typical - sma) / (strategy.constant * np.where(deviation == 0, np.nan, deviation))
+        buy = cci < -100
+        sell = cci > 100
+
+    elif isinstance(strategy, ADXStrategy):
+        dm_plus, dm_minus = directional_movement(paths["High"], paths["Low"])
+        smooth_plus = rolling_mean(dm_plus, strategy.length, backend="numpy")
+        smooth_minus = rolling_mean(dm_minus, strategy.length, backend="numpy")
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dx = np.abs(smooth_plus - smooth_minus) / (smooth_plus + smooth_minus) * 100
+        adx = rolling_mean(dx, strategy.length, backend="numpy")
+        trending = adx > strategy.threshold
+        prev_close = shift(close)
+        buy = trending & (close > prev_close)
+        sell = trending & (close < prev_close)
+
+    elif isinstance(strategy, OBVStrategy):
+        obv_values = obv(close, paths["Volume"], backend="numpy")
+        prev_obv = shift(obv_values.astype(float), periods=strategy.lookback)
+        buy = obv_values > prev_obv
+        sell = obv_values < prev_obv
+
+    else:
+        raise ValueError(f"No batched implementation for {type(strategy).__name__}")
+
+    return buy, sell
+
+
+def robustness_test(df, strategy, n_paths=5000, method="bootstrap", block_size=24, noise_std=0.001,
+                    batch_size=500, initial_cash=10000, commission=0.002, seed=None):
+    """
+    Backtest a strategy on thousands of resampled or perturbed price paths.
+
+    Paths are generated, signalled and simulated batch_size at a time as
+    (paths × bars) arrays, which bounds memory for long histories.
+
+    Parameters:
+    df (pandas.DataFrame): OHLCV data
+    strategy: Strategy instance, e.g. MACDStrategy(12, 26)
+    method (str): "bootstrap" (block bootstrap) or "noise" (perturbed returns)
+
+    Returns:
+    pandas.DataFrame: One row of statistics per path
+    """
+    if method not in ("bootstrap", "noise"):
+        raise ValueError(f"Unknown method '{method}'. Expected 'bootstrap' or 'noise'")
+
+    rng = np.random.default_rng(seed)
+    results = []
+    for start in range(0, n_paths, batch_size):
+        n = min(batch_size, n_paths - start)
+        batch_seed = rng.integers(2**32)
+        if method == "bootstrap":
+            paths = block_bootstrap_paths(df, n, block_size=block_size, seed=batch_seed)
+        else:
+            paths = noise_paths(df, n, noise_std=noise_std, seed=batch_seed)
+
+        buy, sell = batched_signals(strategy, paths)
+        stats = simulate_batch(paths["Open"], paths["Close"], buy, sell,
+                               initial_cash=initial_cash, commission=commission)
+        results.append(pd.DataFrame(stats))
+
+    results = pd.concat(results, ignore_index=True)
+
+    print(f"\n[{type(strategy).__name__}] Robustness over {n_paths} {method} paths:")
+    print("{:<22} {:<10} {:<10} {:<10}".format("Statistic", "5%", "Median", "95%"))
+    for col in ("Return [%]", "Max. Drawdown [%]", "# Trades"):
+        q05, q50, q95 = results[col].quantile([0.05, 0.5, 0.95])
+        print("{:<22} {:<10.2f} {:<10.2f} {:<10.2f}".format(col, q05, q50, q95))
+
+    return results
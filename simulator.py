@@ -0,0 +1,344 @@
+import numpy as np
+
+
+class PortfolioState:
+    """
+    Account state of the long-only, all-in signal strategy used by
+    BacktestingWrapper, carried from one chunk of bars to the next.
+
+    Fills follow backtesting.py: an order placed on a bar's close is filled at
+    the next bar's open, commission is charged on entry and exit, and a buy is
+    cancelled if the account cannot cover size * open * (1 + commission).
+    """
+
+    def __init__(self, initial_cash=10000, commission=0.002):
+        self.initial_cash = initial_cash
+        self.commission = commission
+        self.cash = float(initial_cash)
+        self.size = 0              # Units held (0 when flat)
+        self.entry_price = 0.0
+        self.entry_bar = -1
+        self.pending = 0           # > 0: buy order size, -1: close order, 0: none
+        self.bar = 0               # Global index of the next bar to simulate
+        self.equity = float(initial_cash)
+        self.peak_equity = float(initial_cash)
+        self.max_drawdown = 0.0
+        self.out_of_money = False
+        self.trades = []
+
+
+def simulate_chunk(state, open_, close, buy, sell):
+    """
+    Advance a PortfolioState over a chunk of bars.
+
+    Parameters:
+    state (PortfolioState): State after the previous chunk (modified in place)
+    open_, close (numpy.ndarray): Open and Close prices of the chunk
+    buy, sell (numpy.ndarray): Boolean buy/sell signals of the chunk
+
+    Returns:
+    PortfolioState: The updated state
+    """
+    c = state.commission
+    cash, size, entry_price, entry_bar = state.cash, state.size, state.entry_price, state.entry_bar
+    pending, equity = state.pending, state.equity
+    peak, max_dd = state.peak_equity, state.max_drawdown
+    trades = state.trades
+    offset = state.bar
+
+    open_ = np.asarray(open_, dtype=float)
+    close = np.asarray(close, dtype=float)
+    buy = np.asarray(buy, dtype=bool)
+    sell = np.asarray(sell, dtype=bool)
+
+    for i in range(len(close)):
+        g = offset + i
+        if g == 0 or state.out_of_money:
+            # backtesting.py starts stepping at the second bar
+            continue
+
+        # Fill the order placed on the previous bar at this bar's open
+        if pending > 0:
+            price = open_[i]
+            price_plus_commission = price + (pending * price * c) / pending
+            if pending * price_plus_commission <= max(0.0, cash):
+                size, entry_price, entry_bar = pending, price, g
+                cash -= size * price * c
+        elif pending < 0:
+            price = open_[i]
+            cash += size * (price - entry_price) - size * price * c
+            trades.append(_trade_record(size, entry_bar, g, entry_price, price, c))
+            size = 0
+        pending = 0
+
+        equity = cash + (close[i] * size - size * entry_price)
+        if equity > peak:
+            peak = equity
+        drawdown = 1 - equity / peak
+        if drawdown > max_dd:
+            max_dd = drawdown
+
+        if equity <= 0:
+            state.out_of_money = True
+            cash, size, equity = 0.0, 0, 0.0
+            continue
+
+        if size:
+            if sell[i]:
+                pending = -1
+        elif buy[i]:
+            pending = equity // close[i]
+
+    state.cash, state.size, state.entry_price, state.entry_bar = cash, size, entry_price, entry_bar
+    state.pending, state.equity = pending, equity
+    state.peak_equity, state.max_drawdown = peak, max_dd
+    state.bar = offset + len(close)
+    return state
+
+
+def simulate_events(state, open_, close, buy, sell):
+    """
+    Advance a PortfolioState like simulate_chunk, but only step through
+    bars where something can happen: signal bars and the fills that follow
+    them. Flat stretches are skipped outright and the equity, peak and
+    drawdown of a held position are updated for its whole stretch with one
+    vector operation, so the Python work scales with the number of signals
+    rather than the number of bars. Trades and statistics are identical.
+
+    Parameters:
+    state (PortfolioState): State after the previous chunk (modified in place)
+    open_, close (numpy.ndarray): Open and Close prices of the chunk
+    buy, sell (numpy.ndarray): Boolean buy/sell signals of the chunk
+
+    Returns:
+    PortfolioState: The updated state
+    """
+    c = state.commission
+    cash, size, entry_price, entry_bar = state.cash, state.size, state.entry_price, state.entry_bar
+    pending, equity = state.pending, state.equity
+    peak, max_dd = state.peak_equity, state.max_drawdown
+    offset = state.bar
+    n = len(close)
+
+    open_ = np.asarray(open_, dtype=float)
+    close = np.asarray(close, dtype=float)
+    buy = np.asarray(buy, dtype=bool)
+    sell = np.asarray(sell, dtype=bool)
+    buy_events = np.flatnonzero(buy)
+    sell_events = np.flatnonzero(sell)
+
+    # backtesting.py starts stepping at the second bar
+    i = 1 if offset == 0 else 0
+    while i < n and not state.out_of_money:
+        if pending:
+            # A fill bar is stepped exactly like simulate_chunk
+            g = offset + i
+            price = open_[i]
+            if pending > 0:
+                price_plus_commission = price + (pending * price * c) / pending
+                if pending * price_plus_commission <= max(0.0, cash):
+                    size, entry_price, entry_bar = pending, price, g
+                    cash -= size * price * c
+            else:
+                cash += size * (price - entry_price) - size * price * c
+                state.trades.append(_trade_record(size, entry_bar, g, entry_price, price, c))
+                size = 0
+            pending = 0
+
+            equity = cash + (close[i] * size - size * entry_price)
+            if equity > peak:
+                peak = equity
+            drawdown = 1 - equity / peak
+            if drawdown > max_dd:
+                max_dd = drawdown
+            if equity <= 0:
+                state.out_of_money = True
+                cash, size, equity = 0.0, 0, 0.0
+                break
+
+            if size:
+                if sell[i]:
+                    pending = -1
+            elif buy[i]:
+                pending = equity // close[i]
+            i += 1
+
+        elif not size:
+            # Flat: equity stays at cash until the next buy signal
+            k = np.searchsorted(buy_events, i)
+            if k == len(buy_events):
+                break
+            j = buy_events[k]
+            equity = cash
+            pending = equity // close[j]
+            i = j + 1
+
+        else:
+            # Holding: mark the position to market up to the next sell signal
+            k = np.searchsorted(sell_events, i)
+            j = sell_events[k] if k < len(sell_events) else n - 1
+            span = cash + (close[i:j + 1] * size - size * entry_price)
+            peaks = np.maximum.accumulate(np.concatenate([[peak], span]))[1:]
+            broke = np.flatnonzero(span <= 0)
+            end = broke[0] + 1 if len(broke) else len(span)
+            peak = peaks[end - 1]
+            max_dd = max(max_dd, (1 - span[:end] / peaks[:end]).max())
+            if len(broke):
+                state.out_of_money = True
+                cash, size, equity = 0.0, 0, 0.0
+                break
+            equity = span[-1]
+            if k < len(sell_events):
+                pending = -1
+            i = j + 1
+
+    state.cash, state.size, state.entry_price, state.entry_bar = cash, size, entry_price, entry_bar
+    state.pending, state.equity = pending, equity
+    state.peak_equity, state.max_drawdown = peak, max_dd
+    state.bar = offset + n
+    return state
+
+
+def _trade_record(size, entry_bar, exit_bar, entry_price, exit_price, commission):
+    commissions = size * exit_price * commission + size * entry_price * commission
+    return {
+        "Size": size,
+        "EntryBar": entry_bar,
+        "ExitBar": exit_bar,
+        "EntryPrice": entry_price,
+        "ExitPrice": exit_price,
+        "PnL": size * (exit_price - entry_price) - commissions,
+        "ReturnPct": (exit_price / entry_price - 1) - commissions / (size * entry_price)
+    }
+
+
+def summarize(state):
+    """
+    Build the subset of backtesting.py statistics used across this project.
+
+    Open positions are valued at the last close, as backtesting.py does
+    without finalize_trades.
+    """
+    returns = np.array([t["ReturnPct"] for t in state.trades])
+    n_trades = len(returns)
+    return {
+        "# Trades": n_trades,
+        "Equity Final [$]": state.equity,
+        "Equity Peak [$]": state.peak_equity,
+        "Return [%]": (state.equity - state.initial_cash) / state.initial_cash * 100,
+        "Max. Drawdown [%]": -state.max_drawdown * 100,
+        "Win Rate [%]": (returns > 0).mean() * 100 if n_trades else np.nan,
+        "Best Trade [%]": returns.max() * 100 if n_trades else np.nan,
+        "Worst Trade [%]": returns.min() * 100 if n_trades else np.nan
+    }
+
+
+def signal_arrays(data):
+    """Open, Close, buy and sell arrays of a signal frame (Common* signals take precedence)."""
+    buy_col = 'CommonBuySignal' if 'CommonBuySignal' in data.columns else 'BuySignal'
+    sell_col = 'CommonSellSignal' if 'CommonSellSignal' in data.columns else 'SellSignal'
+    return (data['Open'].values, data['Close'].values,
+            data[buy_col].fillna(False).values.astype(bool), data[sell_col].fillna(False).values.astype(bool))
+
+
+def simulate(data, initial_cash=10000, commission=0.002, mode="bar", trades=False):
+    """
+    Simulate a whole signal frame in memory with the chunk kernel
+    (mode="bar") or the event kernel (mode="event"). With trades=True the
+    trade list is returned as well.
+    """
+    if mode not in ("bar", "event"):
+        raise ValueError(f"Unknown mode '{mode}'. Expected 'bar' or 'event'")
+    state = PortfolioState(initial_cash, commission)
+    kernel = simulate_events if mode == "event" else simulate_chunk
+    kernel(state, *signal_arrays(data))
+    if trades:
+        return summarize(state), state.trades
+    return summarize(state)
+
+
+def simulate_batch(open_, close, buy, sell, initial_cash=10000, commission=0.002, slippage=0.0):
+    """
+    Simulate many independent paths at once with the same rules as
+    simulate_chunk. Bars are stepped in a Python loop while every step is a
+    vector operation across paths.
+
+    Slippage works like backtesting.py's `spread`: entries fill at
+    open * (1 + slippage) while exits fill at the open, so it is the
+    round-trip cost rate on top of commission.
+
+    Parameters:
+    open_, close (numpy.ndarray): Prices of shape (paths, bars)
+    buy, sell (numpy.ndarray): Boolean signals of shape (paths, bars)
+    initial_cash, commission, slippage (float or numpy.ndarray): Scalars or per-path arrays
+
+    Returns:
+    dict: Per-path arrays keyed like the summarize() statistics
+    """
+    open_ = np.asarray(open_, dtype=float)
+    close = np.asarray(close, dtype=float)
+    n_paths, n_bars = close.shape
+    c = np.broadcast_to(np.asarray(commission, dtype=float), (n_paths,))
+    slip = np.broadcast_to(np.asarray(slippage, dtype=float), (n_paths,))
+    start_cash = np.broadcast_to(np.asarray(initial_cash, dtype=float), (n_paths,))
+
+    cash = start_cash.copy()
+    size = np.zeros(n_paths)
+    entry_price = np.zeros(n_paths)
+    pending = np.zeros(n_paths)
+    equity = cash.copy()
+    peak = cash.copy()
+    max_dd = np.zeros(n_paths)
+    alive = np.ones(n_paths, dtype=bool)
+    n_trades = np.zeros(n_paths, dtype=np.int64)
+    n_wins = np.zeros(n_paths, dtype=np.int64)
+    best = np.full(n_paths, -np.inf)
+    worst = np.full(n_paths, np.inf)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for i in range(1, n_bars):
+            o = open_[:, i]
+
+            is_buy = alive & (pending > 0)
+            # Commission on the quoted open decides whether the buy is affordable, as in backtesting.py
+            fill_price = o * (1 + slip)
+            price_plus_commission = fill_price + (pending * o * c) / np.where(is_buy, pending, 1.0)
+            fill = is_buy & (pending * price_plus_commission <= np.maximum(cash, 0.0))
+            cash = np.where(fill, cash - pending * fill_price * c, cash)
+            size = np.where(fill, pending, size)
+            entry_price = np.where(fill, fill_price, entry_price)
+
+            is_close = alive & (pending < 0)
+            commissions = size * o * c + size * entry_price * c
+            trade_return = (o / entry_price - 1) - commissions / (size * entry_price)
+            cash = np.where(is_close, cash + (size * (o - entry_price) - size * o * c), cash)
+            n_trades += is_close
+            n_wins += is_close & (trade_return > 0)
+            best = np.where(is_close, np.maximum(best, trade_return), best)
+            worst = np.where(is_close, np.minimum(worst, trade_return), worst)
+            size = np.where(is_close, 0.0, size)
+
+            equity = np.where(alive, cash + (close[:, i] * size - size * entry_price), equity)
+            peak = np.maximum(peak, equity)
+            max_dd = np.maximum(max_dd, 1 - equity / peak)
+
+            broke = alive & (equity <= 0)
+            if broke.any():
+                alive &= ~broke
+                cash, size, equity = np.where(broke, 0.0, cash), np.where(broke, 0.0, size), np.where(broke, 0.0, equity)
+
+            in_position = size != 0
+            pending = np.where(alive & in_position & sell[:, i], -1.0,
+                               np.where(alive & ~in_position & buy[:, i], equity // close[:, i], 0.0))
+
+    traded = n_trades > 0
+    return {
+        "# Trades": n_trades,
+        "Equity Final [$]": equity,
+        "Equity Peak [$]": peak,
+        "Return [%]": (equity - start_cash) / start_cash * 100,
+        "Max. Drawdown [%]": -max_dd * 100,
+        "Win Rate [%]": np.where(traded, n_wins / np.maximum(n_trades, 1) * 100, np.nan),
+        "Best Trade [%]": np.where(traded, best * 100, np.nan),
+        "Worst Trade [%]": np.where(traded, worst * 100, np.nan)
+    }
@@ -1,6 +1,13 @@
 import numpy as np
+from strategies.backend import resolve_backend, rolling_mean, directional_movement
 
 class ADXStrategy:
+    # Default search space for utils.sweep; keys are constructor arguments
+    param_space = {
+        "length": range(5, 26),
+        "threshold": range(20, 41)
+    }
+
     def __init__(self, length=14, threshold=20):
         # Validate and convert length to integer
         self.length = int(length) if length > 0 else 14  # Default to 14 if invalid
@@ -12,34 +19,56 @@ class ADXStrategy:
                                      np.abs(df['High'] - df['Close'].shift(1))),
                           np.abs(df['Low'] - df['Close'].shift(1)))
 
-    def directional_movement(self, df):
+    def directional_movement(self, df, backend=None):
         # Calculate Directional Movements
+        if resolve_backend(backend) != "pandas":
+            df['DirectionalMovementPlus'], df['DirectionalMovementMinus'] = directional_movement(df['High'], df['Low'])
+            return df
         df['DirectionalMovementPlus'] = np.where(df['High'] - df['High'].shift(1) > df['Low'].shift(1) - df['Low'], 
                                                  np.maximum(df['High'] - df['High'].shift(1), 0), 0)
         df['DirectionalMovementMinus'] = np.where(df['Low'].shift(1) - df['Low'] > df['High'] - df['High'].shift(1),
                                                   np.maximum(df['Low'].shift(1) - df['Low'], 0), 0)
         return df
 
-    def smoothed_values(self, df, length):
+    def smoothed_values(self, df, length, backend=None):
         # Smooth True Range and Directional Movements
+        if resolve_backend(backend) != "pandas":
+            for col in ('TrueRange', 'DirectionalMovementPlus', 'DirectionalMovementMinus'):
+                df[f'Smoothed{col}'] = rolling_mean(df[col], length, backend=backend)
+            return df
         df['SmoothedTrueRange'] = df['TrueRange'].rolling(window=length).mean()
         df['SmoothedDirectionalMovementPlus'] = df['DirectionalMovementPlus'].rolling(window=length).mean()
         df['SmoothedDirectionalMovementMinus'] = df['DirectionalMovementMinus'].rolling(window=length).mean()
         return df
 
-    def calculate_adx(self, df):
+    def calculate_adx(self, df, backend=None):
         # Calculate DX and ADX
         df['DX'] = np.abs(df['SmoothedDirectionalMovementPlus'] - df['SmoothedDirectionalMovementMinus']) / (
                     df['SmoothedDirectionalMovementPlus'] + df['SmoothedDirectionalMovementMinus']) * 100
-        df['ADX'] = df['DX'].rolling(window=self.length).mean()
+        if resolve_backend(backend) != "pandas":
+            df['ADX'] = rolling_mean(df['DX'], self.length, backend=backend)
+        else:
+            df['ADX'] = df['DX'].rolling(window=self.length).mean()
+        return df
+
+    def indicators_from_features(self, df, features):
+        # Same columns as the step-by-step path, read from a FeatureGraph's cache
+        for col, source in (('TrueRange', "true_range"), ('DirectionalMovementPlus', "dm_plus"),
+                            ('DirectionalMovementMinus', "dm_minus")):
+            df[col] = features.get(source)
+            df[f'Smoothed{col}'] = features.get("rolling_mean", source=source, window=self.length)
+        df['DX'] = features.get("dx", window=self.length)
+        df['ADX'] = features.get("adx", window=self.length)
         return df
 
-    def apply_strategy(self, df):
+    def apply_strategy(self, df, backend=None, features=None):
         """
         Apply ADX strategy to the dataframe
         
         Parameters:
         df (pandas.DataFrame): DataFrame with OHLC data
+        backend (str): Indicator backend ("pandas", "numpy" or "numba"); None uses the global one
+        features (features.FeatureGraph): Optional feature graph of df to reuse cached intermediates
         
         Returns:
         pandas.DataFrame: DataFrame with ADX and signals
@@ -48,10 +77,13 @@ class ADXStrategy:
         df = df.copy()
 
         # Calculate True Range, Directional Movements, and ADX
-        df['TrueRange'] = self.true_range(df)
-        df = self.directional_movement(df)
-        df = self.smoothed_values(df, self.length)
-        df = self.calculate_adx(df)
+        if features is not None:
+            df = self.indicators_from_features(df, features)
+        else:
+            df['TrueRange'] = self.true_range(df)
+            df = self.directional_movement(df, backend)
+            df = self.smoothed_values(df, self.length, backend)
+            df = self.calculate_adx(df, backend)
 
         # Add ADX to the dataframe
         df['ADX'] = df['ADX']
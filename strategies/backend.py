@@ -0,0 +1,243 @@
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional
+    njit = None
+
+BACKENDS = ("pandas", "numpy", "numba")
+
+_active_backend = "pandas"
+_warned_no_numba = False
+
+
+def set_backend(name):
+    """
+    Select the indicator backend used when a strategy is applied without an
+    explicit backend argument.
+
+    - "pandas": the original pandas formulas (reference)
+    - "numpy": vectorised array code; recursive EMAs are vectorised across
+      rows for (paths × bars) batches. A single-series EMA is just pandas'
+      compiled ewm, so EMA-based strategies (MACD) run at pandas speed on
+      one series; only the rolling and OBV primitives are faster
+    - "numba": JIT-compiled loops, the fast path for single series
+
+    Parameters:
+    name (str): "pandas", "numpy" or "numba"
+    """
+    global _active_backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}'. Expected one of {BACKENDS}")
+    _active_backend = name
+
+
+def get_backend():
+    return _active_backend
+
+
+def resolve_backend(name=None):
+    """
+    Backend to use for a call, falling back to NumPy (whose single-series
+    EMA is pandas' compiled ewm) when Numba is not installed.
+    """
+    global _warned_no_numba
+    name = name or _active_backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}'. Expected one of {BACKENDS}")
+    if name == "numba" and njit is None:
+        if not _warned_no_numba:
+            print("⚠️ Numba is not installed, using the NumPy backend instead.")
+            _warned_no_numba = True
+        return "numpy"
+    return name
+
+
+# --- Kernels compiled by the Numba backend --------------------------------
+
+def _ewm_mean_kernel(x, span):
+    # pandas' adjusted ewm(span).mean(), step for step, so results match bit for bit
+    alpha = 2.0 / (span + 1.0)
+    old_wt_factor = 1.0 - alpha
+    n = x.shape[0]
+    out = np.empty(n)
+    if n == 0:
+        return out
+    weighted = x[0]
+    out[0] = weighted
+    old_wt = 1.0
+    for i in range(1, n):
+        cur = x[i]
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if cur == cur:
+                if weighted != cur:
+                    weighted = old_wt * weighted + cur
+                    weighted /= old_wt + 1.0
+                old_wt += 1.0
+        elif cur == cur:
+            weighted = cur
+        out[i] = weighted
+    return out
+
+
+def _obv_kernel(close, volume):
+    n = close.shape[0]
+    out = np.zeros(n, dtype=volume.dtype)
+    for i in range(1, n):
+        if close[i] > close[i - 1]:
+            out[i] = out[i - 1] + volume[i]
+        elif close[i] < close[i - 1]:
+            out[i] = out[i - 1] - volume[i]
+        else:
+            out[i] = out[i - 1]
+    return out
+
+
+def _rolling_mean_kernel(x, window, min_periods):
+    n = x.shape[0]
+    out = np.empty(n)
+    total = 0.0
+    count = 0
+    for i in range(n):
+        if x[i] == x[i]:
+            total += x[i]
+            count += 1
+        if i >= window and x[i - window] == x[i - window]:
+            total -= x[i - window]
+            count -= 1
+        out[i] = total / count if count >= min_periods and count > 0 else np.nan
+    return out
+
+
+if njit is not None:
+    _ewm_mean_numba = njit(cache=True)(_ewm_mean_kernel)
+    _obv_numba = njit(cache=True)(_obv_kernel)
+    _rolling_mean_numba = njit(cache=True)(_rolling_mean_kernel)
+
+
+# --- NumPy implementations (operate along the last axis) ------------------
+
+def _ewm_mean_rows(x, span):
+    # Vectorised across rows for NaN-free (paths × bars) input
+    alpha = 2.0 / (span + 1.0)
+    out = np.empty_like(x)
+    weighted = x[:, 0].copy()
+    out[:, 0] = weighted
+    old_wt = 1.0
+    for i in range(1, x.shape[1]):
+        cur = x[:, i]
+        old_wt *= 1.0 - alpha
+        weighted = np.where(weighted != cur, (old_wt * weighted + cur) / (old_wt + 1.0), weighted)
+        old_wt += 1.0
+        out[:, i] = weighted
+    return out
+
+
+def _rolling_sum(x, window):
+    """Rolling sum and count of non-NaN values along the last axis."""
+    valid = ~np.isnan(x)
+    csum = np.cumsum(np.where(valid, x, 0.0), axis=-1)
+    ccount = np.cumsum(valid, axis=-1)
+    csum[..., window:] = csum[..., window:] - csum[..., :-window]
+    ccount[..., window:] = ccount[..., window:] - ccount[..., :-window]
+    return csum, ccount
+
+
+def shift(x, fill=np.nan, periods=1):
+    """Shift values `periods` steps along the last axis, like pandas' shift(periods)."""
+    n = x.shape[-1]
+    pad = np.full(x.shape[:-1] + (min(periods, n),), fill)
+    return np.concatenate([pad, x[..., :max(n - periods, 0)]], axis=-1)
+
+
+# --- Public indicator primitives -------------------------------------------
+
+def ewm_mean(x, span, backend=None):
+    """
+    Adjusted exponential moving average, like pandas' ewm(span).mean().
+
+    The recursion cannot be vectorised along time, so the "numpy" backend
+    only vectorises across rows of a 2-D batch; a single series falls back
+    to pandas (no speedup over the reference) and "numba" is the fast path.
+    """
+    backend = resolve_backend(backend)
+    x = np.asarray(x, dtype=float)
+    if x.ndim == 2 and backend != "pandas":
+        return _ewm_mean_rows(x, span)
+    if backend == "numba":
+        return _ewm_mean_numba(x, span)
+    # A single series gains nothing from a Python loop: use pandas' compiled recursion
+    if x.ndim == 1:
+        return pd.Series(x).ewm(span=span).mean().values
+    return pd.DataFrame(x.T).ewm(span=span).mean().values.T
+
+
+def dema(x, span, backend=None):
+    """Double EMA: 2 * EMA(x) - EMA(EMA(x))."""
+    ma1 = ewm_mean(x, span, backend)
+    ma2 = ewm_mean(ma1, span, backend)
+    return 2 * ma1 - ma2
+
+
+def rolling_mean(x, window, min_periods=None, backend=None):
+    """Rolling mean along the last axis with pandas' min_periods semantics."""
+    backend = resolve_backend(backend)
+    x = np.asarray(x, dtype=float)
+    min_periods = window if min_periods is None else min_periods
+    if backend == "pandas":
+        if x.ndim == 1:
+            return pd.Series(x).rolling(window=window, min_periods=min_periods).mean().values
+        return pd.DataFrame(x.T).rolling(window=window, min_periods=min_periods).mean().values.T
+    if backend == "numba" and x.ndim == 1:
+        return _rolling_mean_numba(x, window, min_periods)
+    total, count = _rolling_sum(x, window)
+    return np.where(count >= min_periods, total / np.maximum(count, 1), np.nan)
+
+
+def rolling_std(x, window, min_periods=None, backend=None):
+    """Rolling sample standard deviation along the last axis."""
+    backend = resolve_backend(backend)
+    x = np.asarray(x, dtype=float)
+    min_periods = window if min_periods is None else min_periods
+    if backend == "pandas":
+        if x.ndim == 1:
+            return pd.Series(x).rolling(window=window, min_periods=min_periods).std().values
+        return pd.DataFrame(x.T).rolling(window=window, min_periods=min_periods).std().values.T
+    # Centre on the first non-NaN value so the squared sums stay small (and warm-up NaNs stay local)
+    first = np.take_along_axis(x, np.argmax(~np.isnan(x), axis=-1)[..., None], axis=-1)
+    x = x - np.where(np.isnan(first), 0.0, first)
+    total, count = _rolling_sum(x, window)
+    total_sq, _ = _rolling_sum(x * x, window)
+    var = (total_sq - total * total / np.maximum(count, 1)) / np.maximum(count - 1, 1)
+    return np.where((count >= min_periods) & (count > 1), np.sqrt(np.maximum(var, 0.0)), np.nan)
+
+
+def obv(close, volume, backend=None):
+    """
+    On-Balance Volume along the last axis, starting from 0. The pandas
+    reference is OBVStrategy.calculate_obv, so "pandas" uses NumPy here.
+    """
+    backend = resolve_backend(backend)
+    close = np.asarray(close, dtype=float)
+    volume = np.asarray(volume)
+    # Widen compact (int32/float32) volumes so the running total cannot overflow
+    volume = volume.astype(np.promote_types(volume.dtype, np.int64))
+    if backend == "numba" and close.ndim == 1:
+        return _obv_numba(close, volume)
+    prev_close = shift(close, fill=0.0)
+    prev_close[..., 0] = close[..., 0]
+    step = np.where(close > prev_close, volume, np.where(close < prev_close, -volume, 0))
+    return np.cumsum(step, axis=-1)
+
+
+def directional_movement(high, low):
+    """+DM and -DM along the last axis (0 on the first bar)."""
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    up = high - shift(high)
+    down = shift(low) - low
+    plus = np.where(up > down, np.maximum(up, 0), 0.0)
+    minus = np.where(down > up, np.maximum(down, 0), 0.0)
+    return plus, minus
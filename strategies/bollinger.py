@@ -1,19 +1,26 @@
 import numpy as np
 import pandas as pd
+from strategies.backend import resolve_backend, rolling_mean, rolling_std
 
 class BollingerBandsStrategy:
+    # Default search space for utils.sweep; keys are constructor arguments
+    param_space = {
+        "length": range(5, 26),
+        "std_dev_multiplier": [round(1 + 0.1 * i, 2) for i in range(21)]
+    }
 
     def __init__(self, length=20, std_dev_multiplier=2):
         # Validate and convert length to integer
         self.length = int(length) if length > 0 else 20  # Default to 20 if invalid
         self.std_dev_multiplier = float(std_dev_multiplier)
 
-    def calculate_bollinger_bands(self, series):
+    def calculate_bollinger_bands(self, series, backend=None):
         """
         Calculate Bollinger Bands for a given price series
         
         Parameters:
         series (pandas.Series): Price series to calculate bands for
+        backend (str): Indicator backend ("pandas", "numpy" or "numba"); None uses the global one
         
         Returns:
         tuple: (middle_band, upper_band, lower_band)
@@ -22,22 +29,40 @@ class BollingerBandsStrategy:
         series = pd.Series(series)
         
         # Calculate rolling mean and standard deviation
-        rolling_mean = series.rolling(window=int(self.length), min_periods=1).mean()
-        rolling_std = series.rolling(window=int(self.length), min_periods=1).std()
+        if resolve_backend(backend) != "pandas":
+            mean = pd.Series(rolling_mean(series, int(self.length), min_periods=1, backend=backend), index=series.index)
+            std = pd.Series(rolling_std(series, int(self.length), min_periods=1, backend=backend), index=series.index)
+        else:
+            mean = series.rolling(window=int(self.length), min_periods=1).mean()
+            std = series.rolling(window=int(self.length), min_periods=1).std()
         
         # Calculate bands
-        middle_band = rolling_mean
-        upper_band = rolling_mean + (rolling_std * self.std_dev_multiplier)
-        lower_band = rolling_mean - (rolling_std * self.std_dev_multiplier)
+        middle_band = mean
+        upper_band = mean + (std * self.std_dev_multiplier)
+        lower_band = mean - (std * self.std_dev_multiplier)
         
         return middle_band, upper_band, lower_band
 
-    def apply_strategy(self, df):
+    def bands_from_features(self, features):
+        """
+        Bollinger Bands from a FeatureGraph's cached rolling mean and
+        standard deviation of Close, shared by every multiplier.
+        
+        Returns:
+        tuple: (middle_band, upper_band, lower_band) as numpy arrays
+        """
+        mean = features.get("rolling_mean", window=int(self.length), min_periods=1)
+        std = features.get("rolling_std", window=int(self.length), min_periods=1)
+        return mean, mean + (std * self.std_dev_multiplier), mean - (std * self.std_dev_multiplier)
+
+    def apply_strategy(self, df, backend=None, features=None):
         """
         Apply Bollinger Bands strategy to the dataframe
         
         Parameters:
         df (pandas.DataFrame): DataFrame with OHLC data
+        backend (str): Indicator backend ("pandas", "numpy" or "numba"); None uses the global one
+        features (features.FeatureGraph): Optional feature graph of df to reuse cached intermediates
         
         Returns:
         pandas.DataFrame: DataFrame with Bollinger Bands and signals
@@ -46,7 +71,10 @@ class BollingerBandsStrategy:
         df = df.copy()
         
         # Calculate Bollinger Bands
-        middle_band, upper_band, lower_band = self.calculate_bollinger_bands(df['Close'])
+        if features is not None:
+            middle_band, upper_band, lower_band = self.bands_from_features(features)
+        else:
+            middle_band, upper_band, lower_band = self.calculate_bollinger_bands(df['Close'], backend)
         
         # Add bands to dataframe
         df['MiddleBand'] = middle_band
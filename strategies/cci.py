@@ -1,7 +1,14 @@
 import numpy as np
 import pandas as pd
+from strategies.backend import resolve_backend, rolling_mean
 
 class CCI_Strategy:
+    # Default search space for utils.sweep; keys are constructor arguments
+    param_space = {
+        "length": range(5, 26),
+        "constant": [0.01, 0.015, 0.02, 0.025]
+    }
+
     def __init__(self, length=20, constant=0.015):
         """
         Initialize CCI Strategy with parameters
@@ -33,32 +40,40 @@ class CCI_Strategy:
         
         return (high + low + close) / 3
 
-    def sma(self, typical_price):
+    def sma(self, typical_price, backend=None):
         """
         Calculate Simple Moving Average (SMA) of the Typical Price
         
         Parameters:
         typical_price (pandas.Series): Typical price series
+        backend (str): Indicator backend; None uses the global one
         
         Returns:
         pandas.Series: Simple Moving Average
         """
+        if resolve_backend(backend) != "pandas":
+            return pd.Series(rolling_mean(typical_price, int(self.length), min_periods=1, backend=backend),
+                             index=typical_price.index)
         return typical_price.rolling(window=int(self.length), min_periods=1).mean()
 
-    def mean_deviation(self, typical_price, sma):
+    def mean_deviation(self, typical_price, sma, backend=None):
         """
         Calculate Mean Deviation
         
         Parameters:
         typical_price (pandas.Series): Typical price series
         sma (pandas.Series): Simple Moving Average series
+        backend (str): Indicator backend; None uses the global one
         
         Returns:
         pandas.Series: Mean Deviation
         """
+        if resolve_backend(backend) != "pandas":
+            return pd.Series(rolling_mean((typical_price - sma).abs(), int(self.length), min_periods=1, backend=backend),
+                             index=typical_price.index)
         return (typical_price - sma).abs().rolling(window=int(self.length), min_periods=1).mean()
 
-    def calculate_cci(self, close, high, low):
+    def calculate_cci(self, close, high, low, backend=None, features=None):
         """
         Calculate Commodity Channel Index (CCI)
         
@@ -66,14 +81,22 @@ class CCI_Strategy:
         close (pandas.Series): Close prices
         high (pandas.Series): High prices
         low (pandas.Series): Low prices
+        backend (str): Indicator backend; None uses the global one
+        features (features.FeatureGraph): Optional feature graph of the frame the prices come from
         
         Returns:
         pandas.Series: CCI values
         """
         try:
-            typical_price = self.typical_price(high, low, close)
-            sma = self.sma(typical_price)
-            mean_deviation = self.mean_deviation(typical_price, sma)
+            if features is not None:
+                typical_price = pd.Series(features.get("typical_price"), index=close.index)
+                sma = pd.Series(features.get("rolling_mean", source="typical_price", window=int(self.length),
+                                             min_periods=1), index=close.index)
+                mean_deviation = pd.Series(features.get("mean_deviation", window=int(self.length)), index=close.index)
+            else:
+                typical_price = self.typical_price(high, low, close)
+                sma = self.sma(typical_price, backend)
+                mean_deviation = self.mean_deviation(typical_price, sma, backend)
             
             # Avoid division by zero
             mean_deviation = mean_deviation.replace(0, float('nan'))
@@ -89,12 +112,14 @@ class CCI_Strategy:
             print(f"Error calculating CCI: {str(e)}")
             return pd.Series(float('nan'), index=close.index)
 
-    def apply_strategy(self, df):
+    def apply_strategy(self, df, backend=None, features=None):
         """
         Apply CCI strategy to the dataframe
         
         Parameters:
         df (pandas.DataFrame): DataFrame with OHLC data
+        backend (str): Indicator backend ("pandas", "numpy" or "numba"); None uses the global one
+        features (features.FeatureGraph): Optional feature graph of df to reuse cached intermediates
         
         Returns:
         pandas.DataFrame: DataFrame with CCI values and signals
@@ -104,7 +129,7 @@ class CCI_Strategy:
             df = df.copy()
             
             # Calculate CCI
-            df['CCI'] = self.calculate_cci(df['Close'], df['High'], df['Low'])
+            df['CCI'] = self.calculate_cci(df['Close'], df['High'], df['Low'], backend, features)
             
             # Generate trading signals
             # Using fillna(False) to ensure no NaN values in signals
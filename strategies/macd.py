@@ -1,29 +1,53 @@
 import pandas as pd
+from strategies.backend import resolve_backend, dema
 
 class MACDStrategy:
+    # Default search space for utils.sweep; keys are constructor arguments
+    param_space = {
+        "fast_length": range(5, 31),
+        "slow_length": range(5, 31),
+        "signal_length": range(5, 16)
+    }
+
+    @staticmethod
+    def valid_params(params):
+        return params["fast_length"] < params["slow_length"]
+
     def __init__(self, fast_length=12, slow_length=26, signal_length=9):
         self.fast_length = fast_length
         self.slow_length = slow_length
         self.signal_length = signal_length
 
-    def ema(self, series, length):
+    def ema(self, series, length, backend=None):
+        if resolve_backend(backend) != "pandas":
+            return dema(series, length, backend)
         series = pd.Series(series)
         ma1 = series.ewm(span=length).mean()
         ma2 = ma1.ewm(span=length).mean()
         return (2 * ma1 - ma2).values
 
-    def calculate_signal(self, macd, length):
+    def calculate_signal(self, macd, length, backend=None):
+        if resolve_backend(backend) != "pandas":
+            return dema(macd, length, backend)
         macd = pd.Series(macd)
         emasig1 = macd.ewm(span=length).mean()
         emasig2 = emasig1.ewm(span=length).mean()
         return (2 * emasig1 - emasig2).values
 
-    def apply_strategy(self, df):
-        close = df['Close']
-        df['MACDFast'] = self.ema(close, self.fast_length)
-        df['MACDSlow'] = self.ema(close, self.slow_length)
-        df['MACD'] = df['MACDFast'] - df['MACDSlow']
-        df['Signal'] = self.calculate_signal(df['MACD'], self.signal_length)
+    def apply_strategy(self, df, backend=None, features=None):
+        # features: optional features.FeatureGraph of df, reusing cached DEMAs (its backend applies)
+        if features is not None:
+            df['MACDFast'] = features.get("dema", span=self.fast_length)
+            df['MACDSlow'] = features.get("dema", span=self.slow_length)
+            df['MACD'] = df['MACDFast'] - df['MACDSlow']
+            df['Signal'] = features.get("macd_signal", fast_length=self.fast_length,
+                                        slow_length=self.slow_length, signal_length=self.signal_length)
+        else:
+            close = df['Close']
+            df['MACDFast'] = self.ema(close, self.fast_length, backend)
+            df['MACDSlow'] = self.ema(close, self.slow_length, backend)
+            df['MACD'] = df['MACDFast'] - df['MACDSlow']
+            df['Signal'] = self.calculate_signal(df['MACD'], self.signal_length, backend)
         df['Histogram'] = df['MACD'] - df['Signal']
         
         # Logic-based Buy and Sell Signals
@@ -1,11 +1,22 @@
 import numpy as np
+from strategies.backend import resolve_backend, obv as backend_obv
 
 class OBVStrategy:
-    def __init__(self):
-        pass
+    # Default search space for utils.sweep; keys are constructor arguments
+    param_space = {
+        "lookback": range(1, 11)
+    }
 
-    def calculate_obv(self, close, volume):
+    def __init__(self, lookback=1):
+        # Bars over which OBV must rise (buy) or fall (sell)
+        self.lookback = int(lookback) if lookback > 0 else 1
+
+    def calculate_obv(self, close, volume, backend=None):
         """Calculate the On-Balance Volume (OBV) indicator."""
+        if resolve_backend(backend) != "pandas":
+            return backend_obv(close, volume, backend)
+        # Widen compact (int32/float32) volumes so the running total cannot overflow
+        volume = volume.astype(np.promote_types(volume.dtype, np.int64))
         obv = [0]  # Start with 0 as initial OBV
         for i in range(1, len(close)):
             if close[i] > close[i - 1]:
@@ -16,17 +27,20 @@ class OBVStrategy:
                 obv.append(obv[-1])  # No change if prices are the same
         return np.array(obv)
 
-    def apply_strategy(self, df):
+    def apply_strategy(self, df, backend=None, features=None):
         # Check if the necessary columns exist
         if 'Close' not in df.columns or 'Volume' not in df.columns:
             raise ValueError("DataFrame must contain 'Close' and 'Volume' columns")
         
         # Calculate OBV and add it to the DataFrame
-        df['OBV'] = self.calculate_obv(df['Close'], df['Volume'])
+        if features is not None:
+            df['OBV'] = features.get("obv")
+        else:
+            df['OBV'] = self.calculate_obv(df['Close'], df['Volume'], backend)
     
         # Logic-based Buy and Sell Signals
-        df['BuySignal'] = df['OBV'] > df['OBV'].shift(1)  # Buy when OBV increases
-        df['SellSignal'] = df['OBV'] < df['OBV'].shift(1)  # Sell when OBV decreases
+        df['BuySignal'] = df['OBV'] > df['OBV'].shift(self.lookback)  # Buy when OBV increases
+        df['SellSignal'] = df['OBV'] < df['OBV'].shift(self.lookback)  # Sell when OBV decreases
     
         # Ensure BuySignal and SellSignal columns exist
         if 'BuySignal' not in df.columns or 'SellSignal' not in df.columns:
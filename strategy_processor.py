@@ -1,74 +1,71 @@
 from strategies.macd import MACDStrategy
 from strategies.bollinger import BollingerBandsStrategy
-from strategies.cci import CCI_Strategy
-from strategies.adx import ADXStrategy
-from strategies.obv import OBVStrategy
 
-from utils import (
-    optimize_macd,
-    optimize_bollinger_bands,
-    optimize_cci,
-    optimize_adx
-)
+from utils import sweep, param_grid
+from features import FeatureGraph, accepts_features
 from backtesting_wrapper import BacktestingWrapper
 
 class StrategyProcessor:
-    def __init__(self, strategy, data, min_length=None, max_length=None, min_threshold=None, max_threshold=None):
+    def __init__(self, strategy, data, min_length=None, max_length=None, min_threshold=None, max_threshold=None,
+                 min_std_dev=None, max_std_dev=None, param_space=None, optimize=False, top_k=5, n_jobs=1,
+                 time_budget=None, max_evals=None):
         self.strategy = strategy
         self.data = data
         self.min_length = min_length
         self.max_length = max_length
         self.min_threshold = min_threshold
         self.max_threshold = max_threshold
+        self.min_std_dev = min_std_dev
+        self.max_std_dev = max_std_dev
+        # Values to search per parameter; optimize=True searches the strategy's full param_space
+        self.param_space = param_space
+        self.optimize = optimize
+        self.top_k = top_k
+        self.n_jobs = n_jobs
+        # Optional sweep budget (seconds / parameter sets); the best found so far is used
+        self.time_budget = time_budget
+        self.max_evals = max_evals
 
+    def search_space(self):
+        """
+        Parameter values to sweep. Parameters without a range keep the
+        current strategy's value, unless optimize=True.
+        """
+        declared = getattr(type(self.strategy), "param_space", {})
+        space = {} if self.optimize else {name: [getattr(self.strategy, name)] for name in declared}
 
-    def process_data(self):
-        if isinstance(self.strategy, MACDStrategy):
-            if self.min_length and self.max_length:
-                params = optimize_macd(self.data, self.min_length, self.max_length)
-                self.strategy = MACDStrategy(
-                    fast_length=params['fast_length'],
-                    slow_length=params['slow_length']
-                )
-            self.data = self.strategy.apply_strategy(self.data)
-
-        elif isinstance(self.strategy, BollingerBandsStrategy):
-            if self.min_length and self.max_length and self.min_std_dev and self.max_std_dev:
-                params = optimize_bollinger_bands(
-                    self.data, self.min_length, self.max_length,
-                    self.min_std_dev, self.max_std_dev
-                )
-                self.strategy = BollingerBandsStrategy(
-                    length=params['length'],
-                    std_dev_multiplier=params['std_dev_multiplier']
-                )
-            self.data = self.strategy.apply_strategy(self.data)
-
-        elif isinstance(self.strategy, CCI_Strategy):
-            if self.min_length and self.max_length:
-                params = optimize_cci(self.data, self.min_length, self.max_length)
-                self.strategy = CCI_Strategy(length=params['length'])
-            self.data = self.strategy.apply_strategy(self.data)
+        if self.min_length and self.max_length:
+            lengths = range(self.min_length, self.max_length + 1)
+            if isinstance(self.strategy, MACDStrategy):
+                space.update(fast_length=lengths, slow_length=lengths)
+            elif "length" in declared:
+                space["length"] = lengths
+        if self.min_threshold and self.max_threshold and "threshold" in declared:
+            space["threshold"] = range(self.min_threshold, self.max_threshold + 1)
+        if self.min_std_dev and self.max_std_dev and "std_dev_multiplier" in declared:
+            steps = int(round((self.max_std_dev - self.min_std_dev) / 0.1))
+            space["std_dev_multiplier"] = [round(self.min_std_dev + 0.1 * i, 2) for i in range(steps + 1)]
 
-        elif isinstance(self.strategy, ADXStrategy):
-            if self.min_length and self.max_length and self.min_threshold and self.max_threshold:
-                params = optimize_adx(
-                    self.data,
-                    self.min_length,
-                    self.max_length,
-                    self.min_threshold,
-                    self.max_threshold
-                )
-                self.strategy = ADXStrategy(
-                    length=params['length'],
-                    threshold=params['threshold']
-                )
-            self.data = self.strategy.apply_strategy(self.data)
+        space.update(self.param_space or {})
+        return space
 
+    def process_data(self):
+        space = self.search_space()
+        if self.optimize or any(len(values) > 1 for values in space.values()):
+            # Bollinger only accepts profitable parameter sets, as optimize_bollinger_bands does
+            min_return = 0 if isinstance(self.strategy, BollingerBandsStrategy) else None
+            top_results = sweep(self.data, type(self.strategy), space, top_k=self.top_k, n_jobs=self.n_jobs,
+                                min_return=min_return, time_budget=self.time_budget, max_evals=self.max_evals)
+            if top_results:
+                params = {name: value for name, value in top_results[0].items() if name != 'return'}
+                self.strategy = type(self.strategy)(**params)
+            elif min_return is not None:
+                # Nothing cleared min_return: fall back to the low end of every range
+                self.strategy = type(self.strategy)(**param_grid(type(self.strategy), space)[0])
 
-        elif isinstance(self.strategy, OBVStrategy):
-            self.data = self.strategy.apply_strategy(self.data)
-
+        # Reuses the intermediates the sweep just cached for the chosen parameters
+        kwargs = {'features': FeatureGraph(self.data)} if accepts_features(self.strategy) else {}
+        self.data = self.strategy.apply_strategy(self.data, **kwargs)
         return self.data
 
     def backtest(self):
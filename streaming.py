@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from strategies.macd import MACDStrategy
+from strategies.bollinger import BollingerBandsStrategy
+from strategies.cci import CCI_Strategy
+from strategies.adx import ADXStrategy
+from strategies.obv import OBVStrategy
+from simulator import PortfolioState, simulate_chunk, summarize
+
+DEFAULT_CHUNK_SIZE = 100_000  # Bars per chunk read from disk
+
+INPUT_COLUMNS = ["Datetime", "Open", "High", "Low", "Close", "Volume"]
+
+
+def iter_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield OHLCV frames of at most chunk_size rows from a Parquet or CSV file
+    sorted by Datetime.
+    """
+    if path.endswith(".parquet"):
+        parquet_file = pq.ParquetFile(path)
+        columns = [c for c in INPUT_COLUMNS if c in parquet_file.schema_arrow.names]
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        for chunk in pd.read_csv(path, parse_dates=["Datetime"], chunksize=chunk_size):
+            yield chunk[[c for c in INPUT_COLUMNS if c in chunk.columns]]
+
+
+def lookback(strategy):
+    """Rows of history a windowed strategy needs before the first row of a chunk."""
+    if isinstance(strategy, BollingerBandsStrategy):
+        return strategy.length - 1
+    if isinstance(strategy, CCI_Strategy):
+        # SMA of typical price, then a rolling mean of deviations from it
+        return 2 * (strategy.length - 1)
+    if isinstance(strategy, ADXStrategy):
+        # Previous bar, smoothing window, then the ADX window over DX
+        return 1 + 2 * (strategy.length - 1)
+    raise ValueError(f"No streaming support for {type(strategy).__name__}")
+
+
+def _ewm_mean(values, span, state):
+    """
+    pandas' adjusted ewm(span).mean() with its running (weighted, old_wt)
+    state exposed so it can continue across chunks.
+    """
+    alpha = 2.0 / (span + 1.0)
+    old_wt_factor = 1.0 - alpha
+    out = np.empty(len(values))
+    weighted, old_wt = state if state is not None else (np.nan, 1.0)
+    start = 0
+
+    if state is None and len(values):
+        weighted = values[0]
+        out[0] = weighted
+        start = 1
+
+    for i in range(start, len(values)):
+        cur = values[i]
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if cur == cur:
+                if weighted != cur:
+                    weighted = old_wt * weighted + cur
+                    weighted /= old_wt + 1.0
+                old_wt += 1.0
+        elif cur == cur:
+            weighted = cur
+        out[i] = weighted
+
+    return out, (weighted, old_wt)
+
+
+def _macd_chunk(strategy, chunk, state):
+    state = state or {}
+    close = chunk['Close'].to_numpy(dtype=float)
+
+    fast1, s_fast1 = _ewm_mean(close, strategy.fast_length, state.get('fast1'))
+    fast2, s_fast2 = _ewm_mean(fast1, strategy.fast_length, state.get('fast2'))
+    slow1, s_slow1 = _ewm_mean(close, strategy.slow_length, state.get('slow1'))
+    slow2, s_slow2 = _ewm_mean(slow1, strategy.slow_length, state.get('slow2'))
+    macd = (2 * fast1 - fast2) - (2 * slow1 - slow2)
+    sig1, s_sig1 = _ewm_mean(macd, strategy.signal_length, state.get('sig1'))
+    sig2, s_sig2 = _ewm_mean(sig1, strategy.signal_length, state.get('sig2'))
+    signal = 2 * sig1 - sig2
+
+    prev_macd = np.concatenate([[state.get('macd', np.nan)], macd[:-1]])
+    prev_signal = np.concatenate([[state.get('signal', np.nan)], signal[:-1]])
+
+    chunk = chunk.copy()
+    chunk['MACD'] = macd
+    chunk['Signal'] = signal
+    chunk['BuySignal'] = (macd > signal) & (prev_macd <= prev_signal)
+    chunk['SellSignal'] = (macd < signal) & (prev_macd >= prev_signal)
+
+    new_state = {
+        'fast1': s_fast1, 'fast2': s_fast2, 'slow1': s_slow1, 'slow2': s_slow2,
+        'sig1': s_sig1, 'sig2': s_sig2, 'macd': macd[-1], 'signal': signal[-1]
+    }
+    return chunk, new_state
+
+
+def _obv_chunk(strategy, chunk, state):
+    close = chunk['Close'].to_numpy()
+    volume = chunk['Volume'].to_numpy()
+    volume = volume.astype(np.promote_types(volume.dtype, np.int64))
+
+    if state is None:
+        prev_close = np.concatenate([[close[0]], close[:-1]])
+        start_obv, history = 0, np.full(strategy.lookback, np.nan)
+    else:
+        prev_close = np.concatenate([[state['close']], close[:-1]])
+        start_obv, history = state['obv'], state['history']
+
+    step = np.where(close > prev_close, volume, np.where(close < prev_close, -volume, 0))
+    obv = start_obv + np.cumsum(step)
+
+    # OBV values `lookback` bars back, carried across the chunk boundary
+    extended = np.concatenate([history, obv])
+    previous = extended[:len(obv)]
+    chunk = chunk.copy()
+    chunk['OBV'] = obv
+    chunk['BuySignal'] = obv > previous
+    chunk['SellSignal'] = obv < previous
+    return chunk, {'close': close[-1], 'obv': obv[-1], 'history': extended[-strategy.lookback:]}
+
+
+def _windowed_chunk(strategy, chunk, state):
+    tail = state if state is not None else chunk.iloc[:0]
+    frame = pd.concat([tail, chunk], ignore_index=True)
+    result = strategy.apply_strategy(frame).iloc[len(tail):]
+
+    n_tail = lookback(strategy)
+    new_tail = frame.iloc[max(len(frame) - n_tail, 0):] if n_tail else frame.iloc[:0]
+    return result, new_tail
+
+
+def apply_strategy_chunk(strategy, chunk, state=None):
+    """
+    Compute indicators and signals for one chunk, continuing from the state
+    returned for the previous chunk (None for the first chunk).
+
+    MACD and OBV carry their recursive state exactly. Windowed strategies
+    (Bollinger, CCI, ADX) re-run on the chunk prefixed with the lookback rows
+    of the previous chunk, which restarts pandas' rolling sums at the overlap.
+
+    Returns:
+    tuple: (chunk with signal columns, state for the next chunk)
+    """
+    if isinstance(strategy, MACDStrategy):
+        return _macd_chunk(strategy, chunk, state)
+    elif isinstance(strategy, OBVStrategy):
+        return _obv_chunk(strategy, chunk, state)
+    return _windowed_chunk(strategy, chunk, state)
+
+
+def stream_backtest(path, strategy, chunk_size=DEFAULT_CHUNK_SIZE, initial_cash=10000, commission=0.002):
+    """
+    Backtest a strategy over an OHLCV file without loading it into memory.
+
+    Chunks flow through apply_strategy_chunk and the simulator kernel, which
+    carries the open position and pending order across chunk boundaries.
+    Peak memory is bounded by chunk_size plus the strategy's lookback.
+
+    Returns:
+    tuple: (stats dict, list of trade dicts)
+    """
+    portfolio = PortfolioState(initial_cash, commission)
+    indicator_state = None
+
+    for chunk in iter_chunks(path, chunk_size):
+        if chunk.empty:
+            continue
+        chunk, indicator_state = apply_strategy_chunk(strategy, chunk.reset_index(drop=True), indicator_state)
+        simulate_chunk(
+            portfolio,
+            chunk['Open'].values,
+            chunk['Close'].values,
+            chunk['BuySignal'].fillna(False).values,
+            chunk['SellSignal'].fillna(False).values
+        )
+
+    return summarize(portfolio), portfolio.trades
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.backend import ewm_mean, dema, rolling_mean, rolling_std, obv
+from strategies.macd import MACDStrategy
+from strategies.bollinger import BollingerBandsStrategy
+from strategies.cci import CCI_Strategy
+from strategies.adx import ADXStrategy
+from strategies.obv import OBVStrategy
+
+BACKENDS = ["numpy", "numba"]
+DTYPES = [np.float64, np.float32]
+
+
+def make_bars(n=400, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = close * (1 + rng.normal(0, 0.003, n))
+    return pd.DataFrame({
+        "Datetime": pd.date_range("2023-01-01", periods=n, freq="h"),
+        "Open": open_,
+        "High": np.maximum(open_, close) * 1.003,
+        "Low": np.minimum(open_, close) * 0.997,
+        "Close": close,
+        "Volume": rng.integers(100_000, 10_000_000, n).astype(float)
+    })
+
+
+def compact(df, dtype):
+    # Prices in dtype and an int32 Volume, like data_loader.compact_frame
+    df = df.copy()
+    for col in ("Open", "High", "Low", "Close"):
+        df[col] = df[col].astype(dtype)
+    df["Volume"] = df["Volume"].astype(np.int32)
+    return df
+
+
+def with_warmup(dtype, n=300):
+    # Leading and interior NaNs, like indicator outputs fed into another indicator
+    x = make_bars(n)["Close"].to_numpy().astype(dtype)
+    x[:10] = np.nan
+    x[50:53] = np.nan
+    return x
+
+
+def assert_close(actual, expected):
+    np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("dtype", DTYPES)
+def test_ewm_and_dema_match_pandas(backend, dtype):
+    x = with_warmup(dtype)
+    for span in (3, 12, 26):
+        assert_close(ewm_mean(x, span, backend), ewm_mean(x, span, "pandas"))
+        assert_close(dema(x, span, backend), dema(x, span, "pandas"))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("dtype", DTYPES)
+def test_rolling_match_pandas(backend, dtype):
+    x = with_warmup(dtype)
+    for window, min_periods in ((5, None), (20, None), (20, 1)):
+        assert_close(rolling_mean(x, window, min_periods, backend), rolling_mean(x, window, min_periods, "pandas"))
+        np.testing.assert_allclose(rolling_std(x, window, min_periods, backend),
+                                   rolling_std(x, window, min_periods, "pandas"), rtol=1e-6, equal_nan=True)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("volume_dtype", [np.int32, np.float32, np.float64])
+def test_obv_matches_reference(backend, volume_dtype):
+    bars = make_bars()
+    volume = bars["Volume"].to_numpy().astype(volume_dtype)
+    expected = OBVStrategy().calculate_obv(bars["Close"], pd.Series(volume), backend="pandas")
+    assert_close(obv(bars["Close"].to_numpy(), volume, backend), expected)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("dtype", DTYPES)
+@pytest.mark.parametrize("strategy", [MACDStrategy(), BollingerBandsStrategy(), CCI_Strategy(), ADXStrategy(),
+                                      OBVStrategy(3)], ids=lambda s: type(s).__name__)
+def test_strategies_match_pandas(backend, dtype, strategy):
+    bars = compact(make_bars(), dtype)
+    reference = strategy.apply_strategy(bars.copy(), backend="pandas")
+    candidate = strategy.apply_strategy(bars.copy(), backend=backend)
+
+    for col in reference.columns.difference(bars.columns):
+        if reference[col].dtype.kind == "f":
+            np.testing.assert_allclose(candidate[col].to_numpy(dtype=float), reference[col].to_numpy(dtype=float),
+                                       rtol=1e-6, atol=1e-6, equal_nan=True, err_msg=col)
+    assert (candidate["BuySignal"] == reference["BuySignal"]).all()
+    assert (candidate["SellSignal"] == reference["SellSignal"]).all()
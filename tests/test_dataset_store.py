@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("darts")
+pytest.importorskip("yfinance")
+
+from market_calendar import session_index
+from dataset_store import DatasetStore
+from lstm_close import preprocess_to_store, ensure_stored
+
+
+def session_bars(start, end, seed=7):
+    times = session_index(pd.Timestamp(start), pd.Timestamp(end), pd.Timedelta(hours=1))
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.005, len(times))))
+    return pd.DataFrame({
+        "Datetime": times,
+        "Open": close * (1 + rng.normal(0, 0.002, len(times))),
+        "High": close * 1.003,
+        "Low": close * 0.997,
+        "Close": close,
+        "Volume": rng.integers(100_000, 1_000_000, len(times)).astype(float)
+    })
+
+
+def test_window_past_stored_range_is_refused_then_extended(tmp_path):
+    data = session_bars("2024-01-02", "2024-04-01")
+    store = DatasetStore(str(tmp_path))
+    stored = preprocess_to_store("TEST", "2024-01-02", "2024-02-01", store=store, data=data)
+
+    # A later signal's window must not be clamped to the stored end
+    with pytest.raises(ValueError, match="outside the stored range"):
+        stored.positions("2024-01-02", "2024-03-01")
+
+    extended = ensure_stored("TEST", "2024-01-15", "2024-03-01", store=store, data=data)
+    start, end = extended.positions("2024-01-15", "2024-03-01")
+    assert pd.Timestamp(int(extended.times[end - 1])) == data.loc[data["Datetime"] < "2024-03-01", "Datetime"].iloc[-1]
+    assert pd.Timestamp(int(extended.times[0])) == data["Datetime"].iloc[0]
+
+    # Covered windows are served without rewriting the store
+    assert ensure_stored("TEST", "2024-01-10", "2024-02-15", store=store, data=data).meta == extended.meta
+
+
+def test_scalers_are_fitted_per_window(tmp_path):
+    from bars import load_history
+    from lstm_close import split_and_scale
+
+    data = session_bars("2024-01-02", "2024-06-01")
+    store = DatasetStore(str(tmp_path))
+    dataset = preprocess_to_store("TEST", "2024-01-02", "2024-06-01", store=store, data=data)
+
+    # A window at the start of a longer store must not see the later bars' min/max
+    start, end = dataset.positions("2024-01-02", "2024-03-01")
+    split = start + int((end - start) * 0.8)
+    target_scaler, covariate_scaler = dataset.fit_scalers(start, split)
+
+    window = load_history("TEST", "2024-01-02", "2024-03-01", data=data)
+    *_, expected_target, expected_covariates, train_size = split_and_scale(window)
+    assert split - start == train_size
+    np.testing.assert_allclose(target_scaler.data_max_, expected_target.data_max_, rtol=1e-6)
+    np.testing.assert_allclose(covariate_scaler.data_min_, expected_covariates.data_min_, rtol=1e-6)
+    assert target_scaler.data_min_[0] > data["Close"].min() + 1
+
+    sample = dataset.training_dataset(24, (target_scaler, covariate_scaler), start, split)[0]
+    expected = expected_target.transform(window[["Close"]].iloc[:24]).ravel()
+    np.testing.assert_allclose(sample["past_target"].ravel(), expected, atol=1e-5)
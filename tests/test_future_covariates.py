@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_calendar import future_bars, next_sessions
+
+STEP = pd.Timedelta(hours=1)
+LAST_BAR = pd.Timestamp("2024-03-08 15:30")  # Friday's last hourly bar
+
+
+def covariates(index):
+    return pd.DataFrame({"High": np.arange(len(index), dtype=float)}, index=index)
+
+
+def test_positional_index_maps_to_next_sessions():
+    # A darts series numbered by bar (to_series convention) must not become 1970 timestamps
+    frame = covariates(pd.RangeIndex(480, 483))
+    aligned = future_bars(frame, LAST_BAR, periods=2, step=STEP)
+
+    assert list(aligned.index) == list(next_sessions(LAST_BAR, 2, STEP))
+    assert aligned.index[0] == pd.Timestamp("2024-03-11 09:30")
+    assert list(aligned["High"]) == [0.0, 1.0]
+
+
+def test_tz_aware_index_is_converted_to_exchange_time():
+    times = pd.DatetimeIndex(["2024-03-11 13:30", "2024-03-11 14:30"], tz="UTC")  # 09:30 and 10:30 New York
+    aligned = future_bars(covariates(times), LAST_BAR, periods=2, step=STEP)
+
+    assert aligned.index.tz is None
+    assert list(aligned.index) == [pd.Timestamp("2024-03-11 09:30"), pd.Timestamp("2024-03-11 10:30")]
+
+
+def test_naive_index_drops_rows_up_to_the_last_bar():
+    times = pd.DatetimeIndex(["2024-03-08 15:30", "2024-03-11 09:30", "2024-03-11 10:30"])
+    aligned = future_bars(covariates(times), LAST_BAR, periods=5, step=STEP)
+
+    assert list(aligned["High"]) == [1.0, 2.0]
+
+
+def test_other_index_types_raise():
+    with pytest.raises(ValueError, match="DatetimeIndex"):
+        future_bars(covariates(pd.Index(["a", "b"])), LAST_BAR, periods=1, step=STEP)
+
+
+def test_pad_future_covariates_uses_positional_timeseries():
+    pytest.importorskip("darts")
+    from darts import TimeSeries
+    from lstm_close import pad_future_covariates
+
+    known = covariates(pd.DatetimeIndex([LAST_BAR]))
+    future = TimeSeries.from_dataframe(covariates(pd.RangeIndex(0, 2)) + 10)
+    future = future.to_dataframe() if hasattr(future, "to_dataframe") else future.pd_dataframe()
+    padded = pad_future_covariates(known, "1h", periods=3, future_scaled=future)
+
+    assert list(padded.index[1:]) == list(next_sessions(LAST_BAR, 3, STEP))
+    assert list(padded["High"]) == [0.0, 10.0, 11.0, 11.0]
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from simulator import simulate
+from streaming import stream_backtest
+from strategies.macd import MACDStrategy
+from strategies.bollinger import BollingerBandsStrategy
+from strategies.cci import CCI_Strategy
+from strategies.adx import ADXStrategy
+from strategies.obv import OBVStrategy
+
+
+def make_bars(n=600, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.005, n)))
+    open_ = close * (1 + rng.normal(0, 0.002, n))
+    return pd.DataFrame({
+        "Datetime": pd.date_range("2023-01-01", periods=n, freq="h"),
+        "Open": open_,
+        "High": np.maximum(open_, close) * 1.002,
+        "Low": np.minimum(open_, close) * 0.998,
+        "Close": close,
+        "Volume": rng.integers(100_000, 10_000_000, n).astype(float)
+    })
+
+
+STRATEGIES = [MACDStrategy(8, 21), BollingerBandsStrategy(20, 2), CCI_Strategy(20), ADXStrategy(14, 20),
+              OBVStrategy()]
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES, ids=lambda s: type(s).__name__)
+@pytest.mark.parametrize("chunk_size", [1, 7, 15, 20, 64, 500])
+def test_stream_matches_in_memory(tmp_path, strategy, chunk_size):
+    # Chunk sizes below the windowed strategies' lookback must still carry every tail row
+    bars = make_bars()
+    path = str(tmp_path / "bars.parquet")
+    bars.to_parquet(path, index=False)
+
+    expected = simulate(strategy.apply_strategy(bars.copy()))
+    stats, _ = stream_backtest(path, strategy, chunk_size=chunk_size)
+
+    assert stats["# Trades"] == expected["# Trades"]
+    assert stats["Return [%]"] == pytest.approx(expected["Return [%]"], abs=1e-9)
@@ -0,0 +1,208 @@
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from multiprocessing.connection import wait
+
+import numpy as np
+import pandas as pd
+
+MODEL_DIR = os.path.join("models", "lstm")  # One directory per ticker and interval
+
+METRIC_COLS = ["Fit [s]", "MAE", "RMSE", "MAPE [%]", "R²"]
+
+
+def model_path(ticker, interval="1h", model_dir=MODEL_DIR):
+    """Directory a farm-trained bundle is persisted in; load it with lstm_close.load_bundle."""
+    return os.path.join(model_dir, ticker.upper(), interval)
+
+
+def _available_cpus():
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+def _set_thread_env(torch_threads):
+    """
+    Set the BLAS/OpenMP thread variables to torch_threads and return their
+    previous values. Spawned workers inherit them at start-up: the child
+    imports this module (and numpy) before its target runs, so setting them
+    inside the worker would come too late for BLAS.
+    """
+    previous = {var: os.environ.get(var) for var in THREAD_ENV_VARS}
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(torch_threads)
+    return previous
+
+
+def _restore_env(previous):
+    for var, value in previous.items():
+        if value is None:
+            os.environ.pop(var, None)
+        else:
+            os.environ[var] = value
+
+
+def _pin_worker(torch_threads, cores):
+    # BLAS thread pools were sized from the environment the worker was spawned with (_set_thread_env)
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+
+    import torch
+    torch.set_num_threads(torch_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # Only settable before torch's first parallel work
+
+
+def _run_worker(conn, torch_threads, cores, args):
+    try:
+        _pin_worker(torch_threads, cores)
+        result = _train_ticker(*args)
+    except Exception as e:
+        result = {"Ticker": args[0].upper(), "Status": "failed", "Error": f"{type(e).__name__}: {e}", "Path": None}
+    conn.send(result)
+    conn.close()
+
+
+def _train_ticker(ticker, start_date, end_date, interval, use_best_config, model_dir, accelerator):
+    """Fit, score and persist one ticker; any error is returned in the result instead of raised."""
+    result = {"Ticker": ticker.upper(), "Status": "failed", "Error": None, "Path": None}
+    result.update({col: np.nan for col in METRIC_COLS})
+    try:
+        from bars import load_history
+        from lstm_close import save_bundle
+        from forecasters import LSTMForecaster, forecast_metrics
+
+        df = load_history(ticker, start_date, end_date, interval=interval)
+        if df is None:
+            raise ValueError("not enough data to train")
+
+        forecaster = LSTMForecaster(ticker, interval, use_best_config=use_best_config, accelerator=accelerator)
+        start = time.perf_counter()
+        forecaster.fit(df)
+        result["Fit [s]"] = time.perf_counter() - start
+
+        # One-step forecasts over the validation bars fit_model held out for early stopping
+        train_size = len(df) - len(forecaster.bundle["recent"])
+        metrics = forecast_metrics(df['Close'].to_numpy(dtype=float)[train_size:],
+                                   forecaster.one_step(df, train_size))
+        result.update(metrics)
+
+        path = model_path(ticker, interval, model_dir)
+        save_bundle(forecaster.bundle, path)
+        with open(os.path.join(path, "metrics.json"), "w") as f:
+            json.dump({col: float(result[col]) for col in METRIC_COLS} |
+                      {"start_date": start_date, "end_date": end_date, "bars": len(df)}, f, indent=2)
+
+        result.update(Status="ok", Path=path)
+    except Exception as e:
+        result["Error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def train_farm(tickers, start_date, end_date, interval="1h", n_workers=None, torch_threads=None, pin_cpus=True,
+               model_dir=MODEL_DIR, use_best_config=True, accelerator="cpu"):
+    """
+    Train one LSTM per ticker, n_workers tickers at a time.
+
+    Every ticker runs in its own spawned process limited to torch_threads
+    intra-op threads (and, with pin_cpus, to its worker slot's cores), so
+    n_workers × torch_threads never oversubscribes the machine and each fit
+    starts from a clean interpreter. Every fitted model and its scalers are
+    persisted under model_dir (see model_path / lstm_close.load_bundle)
+    with the validation metrics next to them.
+
+    A ticker that raises, or whose process dies outright, is reported as
+    failed; the rest of the batch carries on.
+
+    Parameters:
+    tickers (list): Ticker symbols
+    n_workers (int): Concurrent fits (default: one per torch_threads cores, at most one per ticker)
+    torch_threads (int): Threads per fit (default: the cores split evenly over the workers)
+    accelerator (str): Lightning accelerator for every fit; "cpu" for a CPU farm
+
+    Returns:
+    pandas.DataFrame: One row per ticker with status, fit time, MAE/RMSE/MAPE/R², model path and error
+    """
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    cpus = _available_cpus()
+    if n_workers is None:
+        n_workers = max(1, len(cpus) // (torch_threads or 1))
+    n_workers = max(1, min(n_workers, len(tickers)))
+    torch_threads = torch_threads or max(1, len(cpus) // n_workers)
+    # Each worker slot owns a disjoint block of cores (all cores when there are more slots than blocks)
+    slot_cores = [set(cpus[i * torch_threads:(i + 1) * torch_threads]) or None if pin_cpus else None
+                  for i in range(n_workers)]
+
+    print(f"🏭 Training {len(tickers)} tickers on {n_workers} workers × {torch_threads} torch threads")
+    context = multiprocessing.get_context("spawn")  # Fresh interpreters: no torch state inherited from the parent
+    results = {}
+    queue = deque(tickers)
+    free_slots = list(range(n_workers))
+    running = {}
+    previous_env = _set_thread_env(torch_threads)
+    try:
+        while queue or running:
+            while queue and free_slots:
+                ticker, slot = queue.popleft(), free_slots.pop()
+                receiver, sender = context.Pipe(duplex=False)
+                args = (ticker, start_date, end_date, interval, use_best_config, model_dir, accelerator)
+                process = context.Process(target=_run_worker, args=(sender, torch_threads, slot_cores[slot], args))
+                process.start()
+                sender.close()
+                running[receiver] = (process, ticker, slot)
+
+            for receiver in wait(list(running)):
+                process, ticker, slot = running.pop(receiver)
+                try:
+                    result = receiver.recv()
+                except EOFError:
+                    result = None  # The process died before reporting
+                receiver.close()
+                process.join()
+                free_slots.append(slot)
+                if result is None:
+                    result = {"Ticker": ticker, "Status": "failed", "Path": None,
+                              "Error": f"worker exited with code {process.exitcode}"}
+
+                results[ticker] = result
+                status = "✅" if result["Status"] == "ok" else f"❌ {result['Error']}"
+                print(f"{status} {ticker} ({len(results)}/{len(tickers)})")
+    finally:
+        _restore_env(previous_env)
+
+    results = pd.DataFrame([results[ticker] for ticker in tickers],
+                           columns=["Ticker", "Status"] + METRIC_COLS + ["Path", "Error"]).set_index("Ticker")
+
+    print(f"\nTraining farm results ({(results['Status'] == 'ok').sum()} of {len(results)} trained):")
+    print("{:<8} {:<8} ".format("Ticker", "Status") + " ".join("{:<10}".format(col) for col in METRIC_COLS))
+    for ticker, row in results.iterrows():
+        print("{:<8} {:<8} ".format(ticker, row["Status"]) + " ".join("{:<10.4f}".format(row[col]) for col in METRIC_COLS))
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train and persist per-ticker LSTM models in parallel.")
+    parser.add_argument("tickers", nargs="+")
+    parser.add_argument("--start", required=True, help="Start date, e.g. 2024-01-01")
+    parser.add_argument("--end", required=True, help="End date, e.g. 2025-01-01")
+    parser.add_argument("--interval", default="1h")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--torch-threads", type=int, default=None)
+    parser.add_argument("--no-pin", action="store_true", help="Do not pin workers to CPU cores")
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    parser.add_argument("--accelerator", default="cpu")
+    args = parser.parse_args()
+
+    train_farm(args.tickers, args.start, args.end, interval=args.interval, n_workers=args.workers,
+               torch_threads=args.torch_threads, pin_cpus=not args.no_pin, model_dir=args.model_dir,
+               accelerator=args.accelerator)
@@ -1,19 +1,37 @@
-import yfinance as yf
-import pandas as pd
 import numpy as np
+import hashlib
+import heapq
+import os
+import random
+import time
 from itertools import product
 from strategies.macd import MACDStrategy
 from strategies.bollinger import BollingerBandsStrategy
 from strategies.cci import CCI_Strategy
 from strategies.adx import ADXStrategy
 from strategies.obv import OBVStrategy
-from data_loader import fetch_data
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from data_loader import compact_frame, dataset_fingerprint
 
 from backtesting_wrapper import BacktestingWrapper
+from simulator import simulate, simulate_events, summarize, PortfolioState
+from features import FeatureGraph, accepts_features
 
 # Simple in-memory cache
 parameter_cache = {}
 
+# Returns of every evaluated parameter set, keyed by (dataset fingerprint, strategy, params)
+sweep_cache = {}
+
+# Frame and strategy each sweep worker evaluates, set once by _init_sweep_worker
+_sweep_worker = {}
+
+# Packed buy/sell signal bits of every component evaluated by joint_sweep, keyed like sweep_cache
+signal_cache = {}
+
+# Set bits per byte value, for counting signals in packed arrays
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
 def combine_signals(data, selected_strategies):
     data = data.copy()
     data['CommonBuySignal'] = True
@@ -29,100 +47,490 @@ def combine_signals(data, selected_strategies):
 
     return data
 
-def optimize_macd(df, min_length, max_length):
-    key = ("MACD", min_length, max_length)
-    if key in parameter_cache:
-        return parameter_cache[key]
 
-    results = []
-    for fast, slow in product(range(min_length, max_length + 1), repeat=2):
-        if fast < slow:
-            strategy = MACDStrategy(fast, slow)
-            df_with_strategy = strategy.apply_strategy(df.copy())
-            stats = BacktestingWrapper(strategy).backtest(df_with_strategy)
-            results.append({
-                'fast_length': fast,
-                'slow_length': slow,
-                'return': stats['Return [%]']
-            })
+def param_grid(strategy_cls, space=None):
+    """
+    Expand a strategy's declared param_space into keyword-argument dicts.
 
-    top_results = sorted(results, key=lambda x: x['return'], reverse=True)[:5]
+    Parameters:
+    strategy_cls (type): Strategy class with a param_space attribute
+    space (dict): Values to search per parameter, overriding param_space entries
 
-    print("\n[MACD] Top 5 Parameter Combinations:")
-    print("{:<12} {:<12} {:<10}".format("Fast Length", "Slow Length", "Return [%]"))
-    for res in top_results:
-        print("{:<12} {:<12} {:<10.2f}".format(res['fast_length'], res['slow_length'], res['return']))
+    Returns:
+    list[dict]: Every combination that passes the class's valid_params check
+    """
+    space = {**getattr(strategy_cls, "param_space", {}), **(space or {})}
+    names = list(space)
+    valid_params = getattr(strategy_cls, "valid_params", None)
+    grid = [dict(zip(names, values)) for values in product(*(space[name] for name in names))]
+    return [params for params in grid if valid_params is None or valid_params(params)]
 
-    best = top_results[0] if top_results else {'fast_length': min_length, 'slow_length': min_length + 1}
-    parameter_cache[key] = best
-    return best
 
+def _init_sweep_worker(df, strategy_cls, initial_cash, commission, fingerprint=None):
+    # Parameter sets share indicator intermediates through one FeatureGraph per worker
+    features = FeatureGraph(df, fingerprint=fingerprint) if accepts_features(strategy_cls) else None
+    _sweep_worker.update(df=df, strategy_cls=strategy_cls, initial_cash=initial_cash, commission=commission,
+                         features=features)
+
+
+def _sweep_return(params):
+    w = _sweep_worker
+    kwargs = {} if w['features'] is None else {'features': w['features']}
+    df_with_strategy = w['strategy_cls'](**params).apply_strategy(w['df'].copy(), **kwargs)
+    return simulate(df_with_strategy, w['initial_cash'], w['commission'], mode="event")['Return [%]']
+
+
+def _sweep_batch(batch):
+    return [_sweep_return(params) for params in batch]
+
+
+class TopK:
+    """Bounded min-heap of the k best results seen so far."""
+
+    def __init__(self, k):
+        self.k = k
+        self.heap = []
+
+    def push(self, params, ret, order=0):
+        # Ties keep the earlier grid position, like a stable sort by return
+        item = (ret, -order, params)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, item)
+        elif item[:2] > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, item)
+
+    def best(self):
+        return [{**params, 'return': ret} for ret, _, params in sorted(self.heap, key=lambda x: x[:2], reverse=True)]
 
-def optimize_bollinger_bands(df, min_length, max_length, min_std, max_std):
-    results = []
-    for length in range(min_length, max_length + 1):
-        for std in np.arange(min_std, max_std + 0.1, 0.1):
-            std = round(std, 2)
-            strategy = BollingerBandsStrategy(length=length, std_dev_multiplier=std)
-            df_with_strategy = strategy.apply_strategy(df.copy())
-            stats = BacktestingWrapper(strategy).backtest(df_with_strategy)
-            if stats.get('Return [%]', 0) > 0:
-                results.append({
-                    'length': length,
-                    'std_dev_multiplier': std,
-                    'return': stats['Return [%]']
-                })
 
-    top_results = sorted(results, key=lambda x: x['return'], reverse=True)[:5]
+def iter_sweep(df, strategy_cls, space=None, n_jobs=1, initial_cash=10000, commission=0.002,
+               time_budget=None, shuffle=False, seed=None):
+    """
+    Evaluate a strategy's parameter space lazily, yielding every result as
+    soon as it is available: cached parameter sets first, then fresh ones
+    (in batches over worker processes when n_jobs != 1).
 
-    print("\n[BollingerBands] Top 5 Parameter Combinations:")
-    print("{:<10} {:<20} {:<10}".format("Length", "Std Dev Multiplier", "Return [%]"))
+    Results enter sweep_cache as they arrive, so an interrupted sweep
+    resumes where it stopped. Closing the generator, or running out of
+    time_budget, cancels batches that have not started.
+
+    Under a time budget, work goes to the workers one parameter set at a
+    time, every result finished by the deadline is yielded, and at least
+    one result is always awaited, so a short budget still returns a best
+    so far.
+
+    Parameters:
+    time_budget (float): Seconds after which no new work is started
+    shuffle (bool): Evaluate uncached sets in random order, so a sweep cut
+                    short by a budget still samples the whole space
+
+    Yields:
+    tuple: (grid position, params dict, return [%], whether it was cached)
+    """
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    grid = param_grid(strategy_cls, space)
+    fingerprint = dataset_fingerprint(df)
+    keys = [(fingerprint, strategy_cls.__name__, initial_cash, commission, tuple(sorted(params.items())))
+            for params in grid]
+
+    todo = []
+    for i, key in enumerate(keys):
+        if key in sweep_cache:
+            yield i, grid[i], sweep_cache[key], True
+        else:
+            todo.append(i)
+    if shuffle:
+        random.Random(seed).shuffle(todo)
+    yielded = len(todo) < len(keys)
+
+    def expired():
+        return deadline is not None and time.monotonic() >= deadline
+
+    if n_jobs == 1 or len(todo) <= 1:
+        _init_sweep_worker(df, strategy_cls, initial_cash, commission, fingerprint)
+        for i in todo:
+            if yielded and expired():
+                return
+            ret = sweep_cache[keys[i]] = _sweep_return(grid[i])
+            yielded = True
+            yield i, grid[i], ret, False
+        return
+
+    workers = n_jobs or os.cpu_count() or 1
+    # A budget stops between parameter sets, so it hands them out singly
+    batch_size = 1 if deadline is not None else max(1, min(64, len(todo) // (workers * 8)))
+    batches = [todo[start:start + batch_size] for start in range(0, len(todo), batch_size)]
+    executor = ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_sweep_worker,
+                                   initargs=(df, strategy_cls, initial_cash, commission, fingerprint))
+
+    def finished(futures):
+        # Cache the whole of every finished batch first, so an early close loses none of it
+        results = []
+        for future in futures:
+            batch = list(zip(pending.pop(future), future.result()))
+            for i, ret in batch:
+                sweep_cache[keys[i]] = ret
+            results.extend(batch)
+        return results
+
+    try:
+        pending = {}
+        submitted = 0
+        while submitted < len(batches) or pending:
+            # Two batches per worker in flight, so little work is queued past a deadline
+            while submitted < len(batches) and len(pending) < 2 * workers and not expired():
+                batch = batches[submitted]
+                pending[executor.submit(_sweep_batch, [grid[i] for i in batch])] = batch
+                submitted += 1
+            if not pending:
+                return
+            timeout = None if deadline is None or not yielded else max(0.0, deadline - time.monotonic())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for i, ret in finished(done):
+                yielded = True
+                yield i, grid[i], ret, False
+            if yielded and expired():
+                for i, ret in finished([future for future in pending if future.done()]):
+                    yield i, grid[i], ret, False
+                return
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def sweep(df, strategy_cls, space=None, top_k=5, n_jobs=1, min_return=None,
+          initial_cash=10000, commission=0.002, label=None,
+          time_budget=None, max_evals=None, callback=None, shuffle=None, seed=None):
+    """
+    Generic parameter sweep for any strategy that declares a param_space.
+
+    Each parameter set is applied and simulated with simulator.simulate,
+    which matches backtesting.py. Returns are cached per dataset, so
+    repeated or overlapping sweeps only evaluate new parameter sets, and
+    uncached sets are spread over n_jobs worker processes.
+
+    The sweep is anytime: only a bounded top-k heap is kept, a time or
+    evaluation budget stops it early (checked between results), and
+    Ctrl-C also returns the best parameter sets found so far.
+
+    Parameters:
+    df (pandas.DataFrame): OHLCV data
+    strategy_cls (type): Strategy class, e.g. MACDStrategy
+    space (dict): Values to search per parameter (defaults to strategy_cls.param_space)
+    top_k (int): Number of best parameter sets to print and return
+    n_jobs (int): Worker processes; 1 evaluates in-process, None uses all cores
+    min_return (float): Only keep parameter sets returning more than this
+    time_budget (float): Seconds of wall-clock time before stopping
+    max_evals (int): Fresh evaluations before stopping; cached results are free, so
+                     rerunning a budgeted sweep explores max_evals new parameter sets
+    callback (callable): Called as callback(params, ret, best) after every result,
+                         with the current best-first top-k list
+    shuffle (bool): Random evaluation order; defaults to True when a budget is set
+
+    Returns:
+    list[dict]: Up to top_k parameter dicts with their 'return', best first
+    """
+    if shuffle is None:
+        shuffle = time_budget is not None or max_evals is not None
+    total = len(param_grid(strategy_cls, space))
+
+    top = TopK(top_k)
+    evaluated = cached = 0
+    stopped = None
+    results = iter_sweep(df, strategy_cls, space, n_jobs=n_jobs, initial_cash=initial_cash,
+                         commission=commission, time_budget=time_budget, shuffle=shuffle, seed=seed)
+    try:
+        for i, params, ret, was_cached in results:
+            evaluated += 1
+            cached += was_cached
+            if min_return is None or ret > min_return:
+                top.push(params, ret, order=i)
+            if callback is not None:
+                callback(params, ret, top.best())
+            if max_evals is not None and evaluated - cached >= max_evals and evaluated < total:
+                stopped = "⏱️ Evaluation budget reached"
+                break
+        else:
+            if evaluated < total:
+                stopped = "⏱️ Time budget reached"
+    except KeyboardInterrupt:
+        stopped = "⚠️ Interrupted"
+    finally:
+        results.close()
+
+    top_results = top.best()
+    names = list(param_grid(strategy_cls, space)[0]) if total else []
+    if stopped:
+        print(f"\n{stopped} after {evaluated} of {total} parameter sets ({evaluated - cached} fresh); best so far:")
+    print(f"\n[{label or strategy_cls.__name__}] Top {top_k} Parameter Combinations "
+          f"({evaluated} evaluated, {cached} cached):")
+    print(" ".join("{:<20}".format(n) for n in names) + " {:<10}".format("Return [%]"))
     for res in top_results:
-        print("{:<10} {:<20} {:<10.2f}".format(res['length'], res['std_dev_multiplier'], res['return']))
+        print(" ".join("{:<20}".format(str(res[n])) for n in names) + " {:<10.2f}".format(res['return']))
 
-    return top_results[0] if top_results else {'length': min_length, 'std_dev_multiplier': min_std}
+    return top_results
+
+
+def _component_signals(df, strategy_cls, grid, fingerprint):
+    """
+    Packed (buy, sell) signal bits of every parameter set in a grid, with
+    parameter sets that produce identical signals collapsed into the first.
 
+    Returns:
+    list[tuple]: (params, buy bits, sell bits) per distinct signal pair
+    """
+    kwargs = {'features': FeatureGraph(df, fingerprint=fingerprint)} if accepts_features(strategy_cls) else {}
+    unique = {}
+    for params in grid:
+        key = (fingerprint, strategy_cls.__name__, tuple(sorted(params.items())))
+        if key not in signal_cache:
+            out = strategy_cls(**params).apply_strategy(df.copy(), **kwargs)
+            signal_cache[key] = (np.packbits(out['BuySignal'].fillna(False).to_numpy(dtype=bool)),
+                                 np.packbits(out['SellSignal'].fillna(False).to_numpy(dtype=bool)))
+        buy, sell = signal_cache[key]
+        unique.setdefault(buy.tobytes() + sell.tobytes(), (params, buy, sell))
+    return list(unique.values())
 
-def optimize_cci(df, min_length, max_length):
-    results = []
-    for length in range(min_length, max_length + 1):
-        strategy = CCI_Strategy(length=length)
-        df_with_strategy = strategy.apply_strategy(df.copy())
-        stats = BacktestingWrapper(strategy).backtest(df_with_strategy)
-        results.append({
-            'length': length,
-            'return': stats['Return [%]']
-        })
 
-    top_results = sorted(results, key=lambda x: x['return'], reverse=True)[:5]
+def joint_sweep(df, strategies, spaces=None, top_k=5, min_return=None, min_trades=1,
+                initial_cash=10000, commission=0.002, time_budget=None, max_evals=None,
+                callback=None, shuffle=None, seed=None):
+    """
+    Jointly optimise the parameters of several strategies whose signals are
+    ANDed into CommonBuySignal/CommonSellSignal, as combine_signals does.
 
-    print("\n[CCI] Top 5 Parameter Combinations:")
-    print("{:<10} {:<10}".format("Length", "Return [%]"))
+    Each component's signals are computed once per parameter set and kept
+    as packed bits (signal_cache). The product of the parameter spaces is
+    walked depth-first, ANDing the bits strategy by strategy, and a branch
+    is pruned as soon as it has fewer buy signals than min_trades: adding
+    more strategies can only remove signals, so nothing below it can trade.
+    Branches whose partial signals repeat an earlier branch are skipped,
+    and the remaining combinations are simulated with the event kernel.
+
+    Budgets, callback and shuffle work as in sweep().
+
+    Parameters:
+    df (pandas.DataFrame): OHLCV data
+    strategies (dict or list): {label: strategy class}, or classes labelled by name
+    spaces (dict): Optional {label: space} overrides of each class's param_space
+    min_return (float): Only keep combinations returning more than this
+    min_trades (int): Only keep combinations with at least this many closed trades
+
+    Returns:
+    list[dict]: Up to top_k dicts of {label: params}, '# Trades' and 'return', best first
+    """
+    if not isinstance(strategies, dict):
+        strategies = {cls.__name__: cls for cls in strategies}
+    if shuffle is None:
+        shuffle = time_budget is not None or max_evals is not None
+    spaces = spaces or {}
+    labels = list(strategies)
+    fingerprint = dataset_fingerprint(df)
+    n_bars = len(df)
+    open_ = df['Open'].to_numpy(dtype=float)
+    close = df['Close'].to_numpy(dtype=float)
+
+    total = 1
+    components = []
+    for label in labels:
+        grid = param_grid(strategies[label], spaces.get(label))
+        total *= len(grid)
+        distinct = [c for c in _component_signals(df, strategies[label], grid, fingerprint)
+                    if _POPCOUNT[c[1]].sum() >= min_trades]
+        if shuffle:
+            random.Random(seed).shuffle(distinct)
+        components.append(distinct)
+
+    counts = {'pruned': 0, 'duplicate': 0}
+    seen = set()
+    last = len(labels) - 1
+
+    def combinations(level, buy, sell, chosen):
+        for params, component_buy, component_sell in components[level]:
+            combined_buy = component_buy if buy is None else buy & component_buy
+            if _POPCOUNT[combined_buy].sum() < min_trades:
+                counts['pruned'] += 1
+                continue
+            combined_sell = component_sell if sell is None else sell & component_sell
+            key = (level, hashlib.blake2b(combined_buy.tobytes() + combined_sell.tobytes(), digest_size=16).digest())
+            if key in seen:
+                counts['duplicate'] += 1
+                continue
+            seen.add(key)
+            if level == last:
+                yield chosen + [params], combined_buy, combined_sell
+            else:
+                yield from combinations(level + 1, combined_buy, combined_sell, chosen + [params])
+
+    top = TopK(top_k)
+    evaluated = 0
+    stopped = None
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    try:
+        for chosen, buy, sell in combinations(0, None, None, []):
+            state = PortfolioState(initial_cash, commission)
+            simulate_events(state, open_, close,
+                            np.unpackbits(buy, count=n_bars).view(bool), np.unpackbits(sell, count=n_bars).view(bool))
+            stats = summarize(state)
+            evaluated += 1
+
+            combination = dict(zip(labels, chosen))
+            ret = stats['Return [%]']
+            if stats['# Trades'] >= min_trades and (min_return is None or ret > min_return):
+                top.push({**combination, '# Trades': stats['# Trades']}, ret, order=evaluated)
+            if callback is not None:
+                callback(combination, ret, top.best())
+            if max_evals is not None and evaluated >= max_evals:
+                stopped = "⏱️ Evaluation budget reached"
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                stopped = "⏱️ Time budget reached"
+                break
+    except KeyboardInterrupt:
+        stopped = "⚠️ Interrupted"
+
+    top_results = top.best()
+    if stopped:
+        print(f"\n{stopped} after {evaluated} combinations; best so far:")
+    print(f"\n[{' + '.join(labels)}] Top {top_k} Joint Parameter Combinations "
+          f"({total} in product space, {evaluated} simulated, {counts['pruned']} branches pruned without trades, "
+          f"{counts['duplicate']} duplicate):")
+    print(" ".join("{:<40}".format(label) for label in labels) + " {:<10} {:<10}".format("Return [%]", "# Trades"))
     for res in top_results:
-        print("{:<10} {:<10.2f}".format(res['length'], res['return']))
+        print(" ".join("{:<40}".format(str(res[label])) for label in labels)
+              + " {:<10.2f} {:<10}".format(res['return'], res['# Trades']))
+
+    return top_results
+
+
+def joint_signals(df, strategies, combination):
+    """
+    Frame with BuySignal<label>/SellSignal<label> for each strategy of a
+    joint_sweep result and their CommonBuySignal/CommonSellSignal.
+    """
+    if not isinstance(strategies, dict):
+        strategies = {cls.__name__: cls for cls in strategies}
+    data = df.copy()
+    for label, strategy_cls in strategies.items():
+        out = strategy_cls(**combination[label]).apply_strategy(df.copy())
+        data[f'BuySignal{label}'] = out['BuySignal'].fillna(False).astype(bool)
+        data[f'SellSignal{label}'] = out['SellSignal'].fillna(False).astype(bool)
+    return combine_signals(data, list(strategies))
+
+
+def optimize_macd(df, min_length, max_length, **budget):
+    key = ("MACD", min_length, max_length)
+    if key in parameter_cache:
+        return parameter_cache[key]
+
+    lengths = range(min_length, max_length + 1)
+    top_results = sweep(df, MACDStrategy, {'fast_length': lengths, 'slow_length': lengths, 'signal_length': [9]},
+                        label="MACD", **budget)
+
+    best = top_results[0] if top_results else {'fast_length': min_length, 'slow_length': min_length + 1}
+    # A budget-limited best is only a best so far: keep it out of the cache
+    if not any(value is not None for value in budget.values()):
+        parameter_cache[key] = best
+    return best
+
+
+def optimize_bollinger_bands(df, min_length, max_length, min_std, max_std, **budget):
+    stds = [round(std, 2) for std in np.arange(min_std, max_std + 0.1, 0.1)]
+    top_results = sweep(df, BollingerBandsStrategy,
+                        {'length': range(min_length, max_length + 1), 'std_dev_multiplier': stds},
+                        min_return=0, label="BollingerBands", **budget)
+
+    return top_results[0] if top_results else {'length': min_length, 'std_dev_multiplier': min_std}
+
+
+def optimize_cci(df, min_length, max_length, **budget):
+    top_results = sweep(df, CCI_Strategy, {'length': range(min_length, max_length + 1), 'constant': [0.015]},
+                        label="CCI", **budget)
 
     return top_results[0] if top_results else {'length': min_length}
 
 
-def optimize_adx(df, min_length, max_length, min_threshold, max_threshold):
-    results = []
-    for length in range(min_length, max_length + 1):
-        for threshold in range(min_threshold, max_threshold + 1):
-            strategy = ADXStrategy(length=length, threshold=threshold)
-            df_with_strategy = strategy.apply_strategy(df.copy())
+def optimize_adx(df, min_length, max_length, min_threshold, max_threshold, **budget):
+    top_results = sweep(df, ADXStrategy,
+                        {'length': range(min_length, max_length + 1),
+                         'threshold': range(min_threshold, max_threshold + 1)},
+                        label="ADX", **budget)
+
+    return top_results[0] if top_results else {'length': min_length, 'threshold': min_threshold}
+
+
+
+def check_compact_rankings(df, strategy_cls, param_grid, top_k=5):
+    """
+    Precision check for compact_frame: backtest every parameter set on the
+    full-precision frame and on its compact copy, then compare the top-k
+    rankings by return.
+
+    Parameters:
+    df (pandas.DataFrame): Full-precision OHLCV frame
+    strategy_cls (type): Strategy class, e.g. MACDStrategy
+    param_grid (list[dict]): Keyword arguments for each strategy instance
+    top_k (int): Number of leading parameter sets that must agree
+
+    Returns:
+    dict: 'full' and 'compact' top-k rankings and whether they 'match'
+    """
+    compact_df = compact_frame(df)
+    returns = {"full": [], "compact": []}
+
+    for name, frame in (("full", df), ("compact", compact_df)):
+        for params in param_grid:
+            strategy = strategy_cls(**params)
+            df_with_strategy = strategy.apply_strategy(frame.copy())
             stats = BacktestingWrapper(strategy).backtest(df_with_strategy)
-            results.append({
-                'length': length,
-                'threshold': threshold,
-                'return': stats['Return [%]']
-            })
+            returns[name].append(stats['Return [%]'])
 
-    top_results = sorted(results, key=lambda x: x['return'], reverse=True)[:5]
+    rankings = {
+        name: sorted(range(len(param_grid)), key=lambda i: values[i], reverse=True)[:top_k]
+        for name, values in returns.items()
+    }
+    match = rankings["full"] == rankings["compact"]
 
-    print("\n[ADX] Top 5 Parameter Combinations:")
-    print("{:<10} {:<12} {:<10}".format("Length", "Threshold", "Return [%]"))
-    for res in top_results:
-        print("{:<10} {:<12} {:<10.2f}".format(res['length'], res['threshold'], res['return']))
+    print(f"\n[{strategy_cls.__name__}] Compact precision check (top {top_k}):")
+    print("{:<6} {:<40} {:<12} {:<40} {:<12}".format("Rank", "Full", "Return [%]", "Compact", "Return [%]"))
+    for rank, (i, j) in enumerate(zip(rankings["full"], rankings["compact"]), start=1):
+        print("{:<6} {:<40} {:<12.2f} {:<40} {:<12.2f}".format(
+            rank, str(param_grid[i]), returns["full"][i], str(param_grid[j]), returns["compact"][j]))
+    print("✅ Rankings unchanged" if match else "⚠️ Rankings differ between full and compact frames")
 
-    return top_results[0] if top_results else {'length': min_length, 'threshold': min_threshold}
+    return {
+        "full": [param_grid[i] for i in rankings["full"]],
+        "compact": [param_grid[i] for i in rankings["compact"]],
+        "match": match
+    }
+
+
+def check_backends(df, strategies=None, backends=("numpy", "numba"), rtol=1e-6):
+    """
+    Cross-backend equivalence check: apply each strategy with the pandas
+    reference backend and every other backend, and compare indicator columns
+    and signals. Differences are relative to max(|reference|, 1).
+
+    Returns:
+    dict: (strategy name, backend) → {'max_diff': float, 'signal_mismatches': int}
+    """
+    if strategies is None:
+        strategies = [MACDStrategy(), BollingerBandsStrategy(), CCI_Strategy(), ADXStrategy(), OBVStrategy()]
+
+    results = {}
+    print("\n[Backends] Equivalence against pandas:")
+    print("{:<24} {:<10} {:<14} {:<18}".format("Strategy", "Backend", "Max Diff", "Signal Mismatches"))
+    for strategy in strategies:
+        reference = strategy.apply_strategy(df.copy(), backend="pandas")
+        columns = [c for c in reference.columns if c not in df.columns and reference[c].dtype.kind == 'f']
+        for backend in backends:
+            candidate = strategy.apply_strategy(df.copy(), backend=backend)
+            max_diff = max((np.nanmax(np.abs(reference[c].values - candidate[c].values)
+                                      / np.maximum(np.abs(reference[c].values), 1), initial=0.0)
+                            for c in columns), default=0.0)
+            mismatches = int((reference['BuySignal'] != candidate['BuySignal']).sum()
+                             + (reference['SellSignal'] != candidate['SellSignal']).sum())
+            results[(type(strategy).__name__, backend)] = {'max_diff': max_diff, 'signal_mismatches': mismatches}
+            status = "✅" if max_diff <= rtol and mismatches == 0 else "⚠️"
+            print("{:<24} {:<10} {:<14.3e} {:<18} {}".format(type(strategy).__name__, backend, max_diff, mismatches, status))
 
+    return results
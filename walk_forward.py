@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+from simulator import PortfolioState, simulate_chunk, summarize
+from features import FeatureGraph, accepts_features
+
+# Per-worker copies of the price and signal arrays, set once by _init_worker
+_worker_arrays = {}
+
+
+def make_folds(n_bars, train_size, test_size, anchored=False):
+    """
+    Split bar positions into consecutive train/test folds.
+
+    Rolling folds keep a fixed train_size window; anchored folds always train
+    from the first bar. Each test window directly follows its train window.
+
+    Returns:
+    list: (train_start, train_end, test_start, test_end) half-open position ranges
+    """
+    folds = []
+    test_start = train_size
+    while test_start + test_size <= n_bars:
+        train_start = 0 if anchored else test_start - train_size
+        folds.append((train_start, test_start, test_start, test_start + test_size))
+        test_start += test_size
+    return folds
+
+
+def compute_signal_matrix(df, strategy_cls, param_grid):
+    """
+    Run each parameter set over the full history once.
+
+    Indicators only look backwards, so a fold's signals never use bars after
+    it, but they are warmed up on the full history before the fold. Windowed
+    indicators (Bollinger, CCI, ADX) match a per-fold recompute once their
+    window has filled; recursive ones (MACD's EWMs, OBV's running sum) carry
+    state from earlier bars and can differ from a per-fold recompute, which
+    would restart them at the fold's first bar.
+
+    Returns:
+    tuple: (buy, sell) boolean arrays of shape (len(param_grid), len(df))
+    """
+    buy = np.zeros((len(param_grid), len(df)), dtype=bool)
+    sell = np.zeros((len(param_grid), len(df)), dtype=bool)
+    kwargs = {'features': FeatureGraph(df)} if accepts_features(strategy_cls) else {}
+    for k, params in enumerate(param_grid):
+        df_with_strategy = strategy_cls(**params).apply_strategy(df.copy(), **kwargs)
+        buy[k] = df_with_strategy['BuySignal'].fillna(False).to_numpy(dtype=bool)
+        sell[k] = df_with_strategy['SellSignal'].fillna(False).to_numpy(dtype=bool)
+    return buy, sell
+
+
+def _init_worker(open_, close, buy, sell, initial_cash, commission):
+    _worker_arrays.update(open=open_, close=close, buy=buy, sell=sell,
+                          initial_cash=initial_cash, commission=commission)
+
+
+def _slice_stats(k, start, end):
+    a = _worker_arrays
+    state = PortfolioState(a['initial_cash'], a['commission'])
+    simulate_chunk(state, a['open'][start:end], a['close'][start:end],
+                   a['buy'][k, start:end], a['sell'][k, start:end])
+    return summarize(state)
+
+
+def _run_fold(fold):
+    train_start, train_end, test_start, test_end = fold
+    n_params = _worker_arrays['buy'].shape[0]
+
+    train_returns = [_slice_stats(k, train_start, train_end)['Return [%]'] for k in range(n_params)]
+    best = int(np.argmax(train_returns))
+    test_stats = _slice_stats(best, test_start, test_end)
+    return best, train_returns[best], test_stats
+
+
+def walk_forward(df, strategy_cls, param_grid, train_size, test_size, anchored=False,
+                 n_jobs=None, initial_cash=10000, commission=0.002):
+    """
+    Walk-forward optimization: pick the best parameters on each train fold
+    and report how they do on the following test fold.
+
+    Signals for every parameter set are computed once on the full history
+    and shared by all folds; folds are simulated in parallel processes.
+
+    Parameters:
+    df (pandas.DataFrame): OHLCV data with a 'Datetime' column
+    strategy_cls (type): Strategy class, e.g. MACDStrategy
+    param_grid (list[dict]): Keyword arguments for each strategy instance
+    train_size, test_size (int): Fold lengths in bars
+    anchored (bool): Grow the train window from the first bar instead of rolling it
+    n_jobs (int): Worker processes (None uses all cores)
+
+    Returns:
+    pandas.DataFrame: One row per fold with the chosen parameters and returns
+    """
+    folds = make_folds(len(df), train_size, test_size, anchored=anchored)
+    if not folds:
+        raise ValueError(f"Not enough data ({len(df)} bars) for train_size={train_size}, test_size={test_size}")
+
+    buy, sell = compute_signal_matrix(df, strategy_cls, param_grid)
+    arrays = (df['Open'].to_numpy(dtype=float), df['Close'].to_numpy(dtype=float),
+              buy, sell, initial_cash, commission)
+
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=arrays) as executor:
+        fold_results = list(executor.map(_run_fold, folds))
+
+    times = df['Datetime'].reset_index(drop=True) if 'Datetime' in df.columns else pd.Series(df.index)
+    rows = []
+    for i, ((train_start, train_end, test_start, test_end), (best, train_ret, test_stats)) in enumerate(zip(folds, fold_results)):
+        rows.append({
+            'fold': i,
+            'train_start': times[train_start],
+            'test_start': times[test_start],
+            'test_end': times[test_end - 1],
+            'params': param_grid[best],
+            'train_return': train_ret,
+            'test_return': test_stats['Return [%]'],
+            'test_trades': test_stats['# Trades']
+        })
+    results = pd.DataFrame(rows)
+
+    oos_return = (np.prod(1 + results['test_return'] / 100) - 1) * 100
+    print(f"\n[{strategy_cls.__name__}] Walk-forward ({'anchored' if anchored else 'rolling'}, {len(folds)} folds):")
+    print("{:<6} {:<22} {:<40} {:<12} {:<12}".format("Fold", "Test Start", "Parameters", "Train [%]", "Test [%]"))
+    for _, row in results.iterrows():
+        print("{:<6} {:<22} {:<40} {:<12.2f} {:<12.2f}".format(
+            row['fold'], str(row['test_start']), str(row['params']), row['train_return'], row['test_return']))
+    print(f"Compounded out-of-sample return: {oos_return:.2f}%")
+
+    return results